@@ -1,16 +1,33 @@
 #!/usr/bin/env python3
 
 import pandas as pd
-from openpyxl import Workbook
+import numpy as np
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, PatternFill, numbers, Border, Side
 from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.cell_range import CellRange
 from datetime import datetime
 import os
+import io
 import logging
 import traceback
 import sys
+import re
+import textwrap
+from collections import defaultdict
 from typing import List, Tuple
 
+# Optional: memory usage reporting in error logs
+try:
+    import psutil
+    _HAS_PSUTIL = True
+    _PROCESS = psutil.Process()
+except ImportError:
+    psutil = None
+    _HAS_PSUTIL = False
+    _PROCESS = None
+
 class TripleVerbosityErrorLogger:
     """Custom logger for triple verbosity error reporting."""
     
@@ -20,21 +37,27 @@ class TripleVerbosityErrorLogger:
         
         self.log_file = log_file
         self.has_errors = False
-        
-        # Create custom logger
-        self.logger = logging.getLogger('BackorderErrorLogger')
-        self.logger.setLevel(logging.DEBUG)
-        
-        # Remove any existing handlers
-        for handler in self.logger.handlers[:]:
-            self.logger.removeHandler(handler)
-        
-        # Console handler for normal operation
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        console_format = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        console_handler.setFormatter(console_format)
-        self.logger.addHandler(console_handler)
+        self._logger = None
+    
+    @property
+    def logger(self) -> logging.Logger:
+        """Configure the underlying logger on first use."""
+        if self._logger is None:
+            # Create custom logger
+            self._logger = logging.getLogger('BackorderErrorLogger')
+            self._logger.setLevel(logging.DEBUG)
+            
+            # Remove any existing handlers
+            for handler in self._logger.handlers[:]:
+                self._logger.removeHandler(handler)
+            
+            # Console handler for normal operation
+            console_handler = logging.StreamHandler()
+            console_handler.setLevel(logging.INFO)
+            console_format = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+            console_handler.setFormatter(console_format)
+            self._logger.addHandler(console_handler)
+        return self._logger
     
     def log_error(self, error_context: str, exception: Exception, additional_info: dict = None):
         """Log error with triple verbosity to file."""
@@ -48,49 +71,50 @@ class TripleVerbosityErrorLogger:
             file_handler.setFormatter(file_format)
             self.logger.addHandler(file_handler)
         
-        # Triple verbosity error logging
-        error_msg = f"\n{'='*80}\nERROR REPORT - {error_context}\n{'='*80}\n"
-        
-        # Level 1: Basic error information
-        error_msg += f"LEVEL 1 - BASIC ERROR INFO:\n"
-        error_msg += f"  Error Type: {type(exception).__name__}\n"
-        error_msg += f"  Error Message: {str(exception)}\n"
-        error_msg += f"  Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')}\n"
-        error_msg += f"  Context: {error_context}\n\n"
-        
-        # Level 2: Detailed system and environment info
-        error_msg += f"LEVEL 2 - SYSTEM & ENVIRONMENT INFO:\n"
-        error_msg += f"  Python Version: {sys.version}\n"
-        error_msg += f"  Platform: {sys.platform}\n"
-        error_msg += f"  Current Working Directory: {os.getcwd()}\n"
-        error_msg += f"  Script File: {__file__}\n"
-        error_msg += f"  Process ID: {os.getpid()}\n"
-        error_msg += f"  User: {os.getenv('USER', 'Unknown')}\n"
-        
         # Memory info if available
-        try:
-            import psutil
-            process = psutil.Process()
-            error_msg += f"  Memory Usage: {process.memory_info().rss / 1024 / 1024:.2f} MB\n"
-        except ImportError:
-            error_msg += f"  Memory Usage: Not available (psutil not installed)\n"
-        
-        error_msg += "\n"
+        if _HAS_PSUTIL:
+            memory_usage = f"{_PROCESS.memory_info().rss / 1024 / 1024:.2f} MB"
+        else:
+            memory_usage = "Not available (psutil not installed)"
         
-        # Level 3: Full stack trace and additional context
-        error_msg += f"LEVEL 3 - COMPLETE STACK TRACE & CONTEXT:\n"
-        error_msg += f"  Full Stack Trace:\n"
-        for line in traceback.format_exception(type(exception), exception, exception.__traceback__):
-            error_msg += f"    {line.rstrip()}\n"
+        # Triple verbosity error logging, collected as parts and joined once
+        parts = [
+            f"\n{'='*80}\nERROR REPORT - {error_context}\n{'='*80}\n",
+            
+            # Level 1: Basic error information
+            f"LEVEL 1 - BASIC ERROR INFO:\n"
+            f"  Error Type: {type(exception).__name__}\n"
+            f"  Error Message: {str(exception)}\n"
+            f"  Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')}\n"
+            f"  Context: {error_context}\n\n",
+            
+            # Level 2: Detailed system and environment info
+            f"LEVEL 2 - SYSTEM & ENVIRONMENT INFO:\n"
+            f"  Python Version: {sys.version}\n"
+            f"  Platform: {sys.platform}\n"
+            f"  Current Working Directory: {os.getcwd()}\n"
+            f"  Script File: {__file__}\n"
+            f"  Process ID: {os.getpid()}\n"
+            f"  User: {os.getenv('USER', 'Unknown')}\n"
+            f"  Memory Usage: {memory_usage}\n\n",
+            
+            # Level 3: Full stack trace and additional context
+            "LEVEL 3 - COMPLETE STACK TRACE & CONTEXT:\n"
+            "  Full Stack Trace:\n",
+            textwrap.indent("".join(traceback.TracebackException.from_exception(exception).format()), "    "),
+        ]
         
         # Additional context information
         if additional_info:
-            error_msg += f"\n  Additional Context Information:\n"
-            for key, value in additional_info.items():
-                error_msg += f"    {key}: {value}\n"
+            parts.append("\n  Additional Context Information:\n")
+            # Callable values are evaluated only here, once the report is actually being written
+            parts.extend(
+                f"    {key}: {value() if callable(value) else value}\n"
+                for key, value in additional_info.items()
+            )
         
         # Local variables from the exception frame
-        error_msg += f"\n  Local Variables at Error Point:\n"
+        parts.append("\n  Local Variables at Error Point:\n")
         tb = exception.__traceback__
         if tb:
             frame = tb.tb_frame
@@ -98,11 +122,12 @@ class TripleVerbosityErrorLogger:
                 if not var_name.startswith('__'):
                     try:
                         var_str = str(var_value)[:200]  # Limit length
-                        error_msg += f"    {var_name}: {var_str}\n"
+                        parts.append(f"    {var_name}: {var_str}\n")
                     except:
-                        error_msg += f"    {var_name}: <Cannot display value>\n"
+                        parts.append(f"    {var_name}: <Cannot display value>\n")
         
-        error_msg += f"\n{'='*80}\n"
+        parts.append(f"\n{'='*80}\n")
+        error_msg = "".join(parts)
         
         # Log to file
         self.logger.error(error_msg)
@@ -110,10 +135,64 @@ class TripleVerbosityErrorLogger:
         # Also log to console
         print(f"❌ ERROR: {error_context} - See {self.log_file} for detailed report")
 
+def _sample_dir(n: int = 20) -> List[str]:
+    """Return up to n entry names from the current directory without listing all of it."""
+    names = []
+    with os.scandir('.') as it:
+        for i, entry in enumerate(it):
+            if i >= n:
+                break
+            names.append(entry.name)
+    return names
+
+def _excel_column_names(header) -> list:
+    """Name columns the way pd.read_excel does: blank header cells become
+    'Unnamed: <position>' and repeated names get '.1', '.2', ... suffixes."""
+    names = [f"Unnamed: {i}" if value is None or value == "" else value for i, value in enumerate(header)]
+    unnamed = [i for i, value in enumerate(header) if value is None or value == ""]
+    
+    # Named columns are deduplicated before unnamed ones, skipping suffixed
+    # names that already appear in the header
+    counts = defaultdict(int)
+    for i in [i for i in range(len(names)) if i not in unnamed] + unnamed:
+        col = old_col = names[i]
+        cur_count = counts[col]
+        while cur_count > 0:
+            counts[old_col] = cur_count + 1
+            col = f"{old_col}.{cur_count}"
+            cur_count = cur_count + 1 if col in names else counts[col]
+        names[i] = col
+        counts[col] = cur_count + 1
+    return names
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Customer name keywords that mark a Manuel Ortega order as military
+_MIL_KEYWORDS = re.compile(r"DLA|DFAS|NAVSUP", re.IGNORECASE)
+
+# Shared style objects, assigned by reference to every styled cell
+_ALIGN_RIGHT = Alignment(horizontal="right")
+_ALIGN_CENTER = Alignment(horizontal="center")
+_FONT_BOLD = Font(bold=True)
+_FONT_HEADER = Font(bold=True, underline="single")
+_SIDE_THICK = Side(border_style="thick", color="000000")
+_BORDER_THICK = Border(left=_SIDE_THICK, right=_SIDE_THICK, top=_SIDE_THICK, bottom=_SIDE_THICK)
+_CURRENCY_FMT = numbers.FORMAT_CURRENCY_USD_SIMPLE
+_DATE_FMT = "MM-DD-YY"
+
+# Column letters A through Q
+_COL_LETTERS = tuple(get_column_letter(col) for col in range(1, 18))
+
+# Number format per data column (A through Q); None keeps the default
+_DATA_NUMBER_FORMATS = tuple(
+    _CURRENCY_FMT if col in (7, 8, 14, 15, 16)  # G, H, N, O, P
+    else _DATE_FMT if col in (3, 11)  # C, K
+    else None
+    for col in range(1, 18)
+)
+
 class BackorderReportGenerator:
     """Generate backorder reports from Excel data."""
     
@@ -125,6 +204,8 @@ class BackorderReportGenerator:
     
     # Column widths in pixels (A through Q) - B,D,E,I,N,O increased by 10%
     COLUMN_WIDTHS = [54, 160, 80, 167, 54, 49, 75, 75, 256, 125, 80, 45, 45, 75, 83, 83, 400]
+    # Same widths converted to Excel column width units (approximately 7 pixels per unit)
+    COLUMN_WIDTH_UNITS = tuple(width_pixels / 7 for width_pixels in COLUMN_WIDTHS)
     
     # Legend configuration
     LEGEND_CONFIG = [
@@ -133,11 +214,26 @@ class BackorderReportGenerator:
         ("RED", "AT TESTING", "FF0000"),
         ("ORANGE", "SCHEDULED ORDER", "FFA500")
     ]
+    LEGEND_FILLS = {
+        hex_color: PatternFill(start_color=hex_color, end_color=hex_color, fill_type="solid")
+        for _, _, hex_color in LEGEND_CONFIG
+    }
     
-    def __init__(self, input_file: str, sort_column: str = "order_no"):
+    def __init__(self, input_file: str, sort_column: str = "order_no", df: pd.DataFrame = None,
+                 error_logger: TripleVerbosityErrorLogger = None):
         self.input_file = input_file
         self.sort_column = sort_column
-        self.error_logger = TripleVerbosityErrorLogger()
+        # Frame already returned by load_and_clean_data for input_file; skips re-reading the file
+        self.df = df
+        # Caller's error logger, so one run's error reports share a single log file
+        self._error_logger = error_logger
+    
+    @property
+    def error_logger(self) -> TripleVerbosityErrorLogger:
+        """Create the error logger only when an error is first reported, unless one was given."""
+        if self._error_logger is None:
+            self._error_logger = TripleVerbosityErrorLogger()
+        return self._error_logger
         
     def validate_input_file(self) -> None:
         """Validate that input file exists."""
@@ -155,8 +251,8 @@ class BackorderReportGenerator:
         except Exception as e:
             additional_info = {
                 "input_file_path": self.input_file,
-                "current_directory": os.getcwd(),
-                "directory_contents": str(os.listdir('.'))[:500]
+                "current_directory": os.getcwd,
+                "directory_contents": _sample_dir
             }
             self.error_logger.log_error("File Validation", e, additional_info)
             raise
@@ -166,23 +262,61 @@ class BackorderReportGenerator:
         try:
             logger.info(f"Loading data from {self.input_file}")
             
-            # Try reading the file
-            df = pd.read_excel(self.input_file)
-            logger.info(f"Initial data shape: {df.shape}")
-            
-            # Validate we have enough columns before dropping
-            required_columns = max([0, 3, 4, 8, 9, 15, 17, 19]) + 1
-            if len(df.columns) < required_columns:
-                raise ValueError(f"Input file must have at least {required_columns} columns, but only has {len(df.columns)}")
-            
-            original_columns = list(df.columns)
-            logger.info(f"Original columns: {original_columns}")
-            
-            # Drop specified columns by index (A,D,E,I,J,P,R,T)
+            # Columns to drop by index (A,D,E,I,J,P,R,T)
             drop_indices = [0, 3, 4, 8, 9, 15, 17, 19]
-            drop_cols = [df.columns[i] for i in drop_indices if i < len(df.columns)]
-            df.drop(columns=drop_cols, inplace=True)
-            df.reset_index(drop=True, inplace=True)
+            required_columns = max(drop_indices) + 1
+            
+            file_extension = os.path.splitext(self.input_file)[1].lower()
+            if file_extension in (".xlsx", ".xlsm"):
+                # Stream rows in read-only mode and keep only the needed columns,
+                # so no DataFrame storage is ever allocated for dropped ones
+                wb = load_workbook(self.input_file, read_only=True, data_only=True)
+                try:
+                    rows = wb.active.iter_rows(values_only=True)
+                    header = next(rows, ())
+                    logger.info(f"Initial data columns: {len(header)}")
+                    
+                    # Validate we have enough columns before dropping
+                    if len(header) < required_columns:
+                        raise ValueError(f"Input file must have at least {required_columns} columns, but only has {len(header)}")
+                    
+                    logger.info(f"Original columns: {_excel_column_names(header)}")
+                    
+                    keep_indices = [i for i in range(len(header)) if i not in drop_indices]
+                    data = []
+                    filled_rows = 0
+                    for row in rows:
+                        data.append([row[i] if i < len(row) else None for i in keep_indices])
+                        if any(value is not None for value in row):
+                            filled_rows = len(data)
+                    # Like pd.read_excel, keep blank rows inside the data but drop trailing ones
+                    del data[filled_rows:]
+                finally:
+                    wb.close()
+                
+                columns = _excel_column_names(header)
+                df = pd.DataFrame(data, columns=[columns[i] for i in keep_indices]).fillna(np.nan)
+            else:
+                if file_extension == ".csv":
+                    # Text exports skip the Excel parser entirely
+                    df = pd.read_csv(self.input_file)
+                elif file_extension == ".parquet":
+                    df = pd.read_parquet(self.input_file)
+                else:
+                    # Legacy .xls files are not readable by openpyxl
+                    df = pd.read_excel(self.input_file)
+                logger.info(f"Initial data shape: {df.shape}")
+                
+                # Validate we have enough columns before dropping
+                if len(df.columns) < required_columns:
+                    raise ValueError(f"Input file must have at least {required_columns} columns, but only has {len(df.columns)}")
+                
+                original_columns = list(df.columns)
+                logger.info(f"Original columns: {original_columns}")
+                
+                drop_cols = [df.columns[i] for i in drop_indices if i < len(df.columns)]
+                df.drop(columns=drop_cols, inplace=True)
+                df.reset_index(drop=True, inplace=True)
             
             logger.info(f"Remaining columns after dropping: {list(df.columns)}")
             logger.info(f"Data shape after cleaning: {df.shape}")
@@ -193,6 +327,10 @@ class BackorderReportGenerator:
             if missing_cols:
                 logger.warning(f"Missing columns: {missing_cols}. Available columns: {list(df.columns)}")
             
+            # CSV has no date cell type, so parse the order date the Excel readers return as datetime
+            if file_extension == ".csv" and "order_dt" in df.columns:
+                df["order_dt"] = pd.to_datetime(df["order_dt"], errors="coerce")
+            
             # Convert due_date with error handling
             if "due_date" in df.columns:
                 original_due_date_sample = df["due_date"].head().tolist()
@@ -202,6 +340,16 @@ class BackorderReportGenerator:
                     logger.warning(f"Found {null_dates} invalid dates that were set to NaT")
                     logger.info(f"Sample original due_date values: {original_due_date_sample}")
             
+            # Salesperson names repeat heavily; categorical codes make every later mask a small-int compare
+            if "slsman_nam" in df.columns:
+                df["slsman_nam"] = df["slsman_nam"].astype("category")
+            
+            # Check for non-numeric order numbers once, before the data is split
+            if self.sort_column == "order_no" and "order_no" in df.columns:
+                non_numeric_orders = pd.to_numeric(df["order_no"], errors="coerce").isna().sum()
+                if non_numeric_orders > 0:
+                    logger.warning(f"Found {non_numeric_orders} non-numeric order numbers")
+            
             return df
             
         except Exception as e:
@@ -234,27 +382,21 @@ class BackorderReportGenerator:
                 logger.warning("Required columns not found, creating empty DataFrames")
                 return pd.DataFrame(), pd.DataFrame()
             
-            # Get unique salesperson names for logging
-            unique_salespeople = df["slsman_nam"].unique()
-            logger.info(f"Unique salesperson names: {unique_salespeople}")
-            
-            # Normalize to lowercase for case-insensitive matching
-            df["cust_name_lower"] = df["cust_name"].str.lower()
+            # Unique salesperson names are a full column scan, so only compute them for debug logging
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Unique salesperson names: %s", df["slsman_nam"].unique())
             
-            # Masks
-            manuel_mask = df["slsman_nam"].str.upper() == "MANUEL ORTEGA"
-            keyword_mask = df["cust_name_lower"].apply(
-                lambda x: any(keyword.lower() in x for keyword in ["DLA", "DFAS", "NAVSUP"]) if isinstance(x, str) else False
-            )
+            # Military = Manuel Ortega orders for DLA/DFAS/NAVSUP customers (case-insensitive)
+            # Match case-insensitively against the (few) categories, then test membership by code
+            salespeople = df["slsman_nam"].astype("category")
+            categories = salespeople.cat.categories
+            manuel_mask = salespeople.isin(categories[categories.str.upper() == "MANUEL ORTEGA"])
+            keyword_mask = df["cust_name"].str.contains(_MIL_KEYWORDS, na=False)
+            mil_mask = manuel_mask & keyword_mask
             
             # Split
-            military_df = df[manuel_mask & keyword_mask].copy()
-            commercial_df = df[~(manuel_mask & keyword_mask)].copy()
-            
-            # Clean up helper column
-            for d in [military_df, commercial_df]:
-                if "cust_name_lower" in d.columns:
-                    d.drop(columns=["cust_name_lower"], inplace=True)
+            military_df = df.loc[mil_mask]
+            commercial_df = df.loc[~mil_mask]
             
             logger.info(f"Military orders: {len(military_df)}, Commercial orders: {len(commercial_df)}")
             return military_df, commercial_df
@@ -263,8 +405,7 @@ class BackorderReportGenerator:
             additional_info = {
                 "dataframe_shape": df.shape,
                 "slsman_nam_in_columns": "slsman_nam" in df.columns,
-                "cust_name_in_columns": "cust_name" in df.columns,
-                "unique_salespeople": df["slsman_nam"].unique().tolist() if "slsman_nam" in df.columns else "Column not found"
+                "cust_name_in_columns": "cust_name" in df.columns
             }
             self.error_logger.log_error("Data Splitting by Salesperson", e, additional_info)
             raise
@@ -287,31 +428,13 @@ class BackorderReportGenerator:
             logger.info(f"Sorting dataframes by column: {actual_sort_column}")
             
             if not military_df.empty and actual_sort_column in military_df.columns:
-                if actual_sort_column == "order_no":
-                    # Check for non-numeric order numbers
-                    non_numeric_orders = military_df[pd.to_numeric(military_df[actual_sort_column], errors='coerce').isna()]
-                    if not non_numeric_orders.empty:
-                        logger.warning(f"Found {len(non_numeric_orders)} non-numeric order numbers in military data")
-                elif actual_sort_column == "due_date":
-                    # Ensure due_date is datetime for proper sorting
-                    military_df[actual_sort_column] = pd.to_datetime(military_df[actual_sort_column], errors="coerce")
-                
-                military_df = military_df.sort_values(by=actual_sort_column)
+                military_df = military_df.sort_values(by=actual_sort_column, kind="stable")
                 logger.info(f"Military data sorted by {actual_sort_column}: {len(military_df)} rows")
             elif not military_df.empty:
                 logger.warning(f"{actual_sort_column} column not found in military data - skipping sort")
             
             if not commercial_df.empty and actual_sort_column in commercial_df.columns:
-                if actual_sort_column == "order_no":
-                    # Check for non-numeric order numbers
-                    non_numeric_orders = commercial_df[pd.to_numeric(commercial_df[actual_sort_column], errors='coerce').isna()]
-                    if not non_numeric_orders.empty:
-                        logger.warning(f"Found {len(non_numeric_orders)} non-numeric order numbers in commercial data")
-                elif actual_sort_column == "due_date":
-                    # Ensure due_date is datetime for proper sorting
-                    commercial_df[actual_sort_column] = pd.to_datetime(commercial_df[actual_sort_column], errors="coerce")
-                
-                commercial_df = commercial_df.sort_values(by=actual_sort_column)
+                commercial_df = commercial_df.sort_values(by=actual_sort_column, kind="stable")
                 logger.info(f"Commercial data sorted by {actual_sort_column}: {len(commercial_df)} rows")
             elif not commercial_df.empty:
                 logger.warning(f"{actual_sort_column} column not found in commercial data - skipping sort")
@@ -350,25 +473,10 @@ class BackorderReportGenerator:
             comparison_cols = [col for col in commercial_df.columns if col != "slsman_nam"]
             logger.info(f"Comparing {len(comparison_cols)} columns for deduplication")
             
-            to_remove_idx = []
-            for sara_idx, sara_row in sara_rows.iterrows():
-                # Check if any Lisa row matches all columns except salesman name
-                for lisa_idx, lisa_row in lisa_rows.iterrows():
-                    # Compare all non-salesman columns
-                    match = True
-                    for col in comparison_cols:
-                        if sara_row[col] != lisa_row[col]:
-                            # Handle NaN comparisons
-                            if pd.isna(sara_row[col]) and pd.isna(lisa_row[col]):
-                                continue
-                            match = False
-                            break
-                    
-                    if match:
-                        logger.info(f"Found duplicate: Sara row {sara_idx} matches Lisa row {lisa_idx}")
-                        logger.info(f"  Order: {sara_row.get('order_no', 'N/A')}, Item: {sara_row.get('item_no', 'N/A')}")
-                        to_remove_idx.append(sara_idx)
-                        break  # Found a match, no need to check other Lisa rows
+            # Hash-based lookup of Sara rows whose key (all non-salesman columns) appears in Lisa's rows
+            lisa_keys = pd.MultiIndex.from_frame(lisa_rows[comparison_cols])
+            sara_keys = pd.MultiIndex.from_frame(sara_rows[comparison_cols])
+            to_remove_idx = sara_rows.index[sara_keys.isin(lisa_keys)].tolist()
             
             if to_remove_idx:
                 commercial_df = commercial_df.drop(index=to_remove_idx)
@@ -383,7 +491,6 @@ class BackorderReportGenerator:
             additional_info = {
                 "commercial_df_shape": commercial_df.shape if not commercial_df.empty else "Empty DataFrame",
                 "has_slsman_nam_column": "slsman_nam" in commercial_df.columns if not commercial_df.empty else "Empty DataFrame",
-                "unique_salespeople": commercial_df["slsman_nam"].unique().tolist() if not commercial_df.empty and "slsman_nam" in commercial_df.columns else "N/A",
                 "lisa_count": len(commercial_df[commercial_df["slsman_nam"] == "Lisa Miller"]) if not commercial_df.empty and "slsman_nam" in commercial_df.columns else 0,
                 "sara_count": len(commercial_df[commercial_df["slsman_nam"] == "Sara Burrell"]) if not commercial_df.empty and "slsman_nam" in commercial_df.columns else 0
             }
@@ -391,7 +498,7 @@ class BackorderReportGenerator:
             raise
     
     def add_data_to_sheet(self, ws, data: pd.DataFrame) -> None:
-        """Add data rows to worksheet."""
+        """Stream data rows to worksheet with formulas and number formatting."""
         try:
             expected_cols = [
                 "order_no", "cust_po", "order_dt", "item_no", "manu_no", "ship_asap",
@@ -401,19 +508,31 @@ class BackorderReportGenerator:
             
             logger.info(f"Adding {len(data)} rows to worksheet")
             
-            for row_idx, (_, row) in enumerate(data.iterrows()):
-                row_data = []
-                for col in expected_cols:
-                    if col in data.columns:
-                        row_data.append(row[col])
-                    else:
-                        row_data.append("")  # Default for missing columns
+            # Reindex once so missing columns default to "" and rows iterate as plain object arrays
+            values = data.reindex(columns=expected_cols, fill_value="").to_numpy(dtype=object)
+            
+            for row_idx, row in enumerate(values):
+                row_num = row_idx + 2
+                row_data = list(row)
+                
+                # Add calculated columns (adjusted for new P.O. ALLOC. column at M)
+                row_data.extend([
+                    f"=G{row_num}-H{row_num}",  # GP UNIT (N)
+                    f"=N{row_num}*L{row_num}",  # GP TOTAL (O)
+                    f"=L{row_num}*G{row_num}",  # TOTAL SALE (P)
+                    ""  # COMMENTS
+                ])
                 
-                # Add calculated columns (will be filled with formulas later)
-                row_data.extend([None, None, None, ""])  # GP UNIT, GP TOTAL, TOTAL SALE, COMMENTS
-                ws.append(row_data)
+                cells = []
+                for value, number_format in zip(row_data, _DATA_NUMBER_FORMATS):
+                    cell = WriteOnlyCell(ws, value=value)
+                    cell.alignment = _ALIGN_RIGHT
+                    if number_format:
+                        cell.number_format = number_format
+                    cells.append(cell)
+                ws.append(cells)
             
-            logger.info(f"Successfully added {len(data)} data rows to worksheet")
+            logger.info(f"Successfully added {len(data)} data rows with formulas and formatting")
             
         except Exception as e:
             additional_info = {
@@ -427,12 +546,15 @@ class BackorderReportGenerator:
             raise
     
     def format_sheet_headers(self, ws) -> None:
-        """Apply formatting to sheet headers."""
+        """Write the formatted header row."""
         try:
-            for col in range(1, len(self.HEADERS) + 1):
-                cell = ws[f"{get_column_letter(col)}1"]
-                cell.font = Font(bold=True, underline="single")
-                cell.alignment = Alignment(horizontal="center")
+            cells = []
+            for header in self.HEADERS:
+                cell = WriteOnlyCell(ws, value=header)
+                cell.font = _FONT_HEADER
+                cell.alignment = _ALIGN_CENTER
+                cells.append(cell)
+            ws.append(cells)
             
             logger.info(f"Applied header formatting to {len(self.HEADERS)} columns")
             
@@ -448,10 +570,9 @@ class BackorderReportGenerator:
     def set_column_widths(self, ws) -> None:
         """Set column widths in pixels."""
         try:
-            for col, width_pixels in enumerate(self.COLUMN_WIDTHS, start=1):
-                # Convert pixels to Excel column width units (approximately 7 pixels per unit)
-                width_units = width_pixels / 7
-                ws.column_dimensions[get_column_letter(col)].width = width_units
+            dims = ws.column_dimensions
+            for letter, width_units in zip(_COL_LETTERS, self.COLUMN_WIDTH_UNITS):
+                dims[letter].width = width_units
             
             logger.info(f"Set column widths for {len(self.COLUMN_WIDTHS)} columns")
             
@@ -463,67 +584,33 @@ class BackorderReportGenerator:
             self.error_logger.log_error("Column Width Setting", e, additional_info)
             raise
     
-    def add_formulas_and_formatting(self, ws) -> None:
-        """Add Excel formulas and number formatting."""
+    def add_totals_row(self, ws, max_row: int) -> int:
+        """Add totals row below the last data row and return the row number."""
         try:
-            max_row = ws.max_row
-            logger.info(f"Adding formulas and formatting to {max_row - 1} data rows")
-            
-            for row in range(2, max_row + 1):
-                # Add formulas (adjusted for new P.O. ALLOC. column at M)
-                ws[f"N{row}"] = f"=G{row}-H{row}"  # GP UNIT (shifted from M to N)
-                ws[f"O{row}"] = f"=N{row}*L{row}"  # GP TOTAL (shifted from N to O, reference changed)
-                ws[f"P{row}"] = f"=L{row}*G{row}"  # TOTAL SALE (shifted from O to P)
-                
-                # Apply alignment
-                for col in range(1, len(self.HEADERS) + 1):
-                    ws[f"{get_column_letter(col)}{row}"].alignment = Alignment(horizontal="right")
-                
-                # Apply currency formatting (updated to include N, O, P)
-                for col in ["G", "H", "N", "O", "P"]:
-                    cell = ws[f"{col}{row}"]
-                    cell.number_format = numbers.FORMAT_CURRENCY_USD_SIMPLE
-                
-                # Apply date formatting to columns C and K (MM-DD-YY format)
-                for col in ["C", "K"]:
-                    cell = ws[f"{col}{row}"]
-                    cell.number_format = "MM-DD-YY"
-            
-            logger.info("Successfully applied formulas and formatting")
-            
-        except Exception as e:
-            additional_info = {
-                "worksheet_max_row": ws.max_row,
-                "worksheet_name": ws.title if hasattr(ws, 'title') else "Unknown",
-                "current_row_being_processed": row if 'row' in locals() else "N/A"
-            }
-            self.error_logger.log_error("Formula and Formatting Application", e, additional_info)
-            raise
-    
-    def add_totals_row(self, ws) -> int:
-        """Add totals row and return the row number."""
-        try:
-            max_row = ws.max_row
             total_row = max_row + 3
             
-            # Add total formulas (adjusted for new column positions)
-            ws[f"O{total_row}"] = f"=SUM(O2:O{max_row})"  # GP TOTAL (shifted from N to O)
-            ws[f"P{total_row}"] = f"=SUM(P2:P{max_row})"  # TOTAL SALE (shifted from O to P)
+            # Blank spacer rows between data and totals
+            for _ in range(max_row + 1, total_row):
+                ws.append([])
             
-            # Format totals
-            for col in ["O", "P"]:
-                cell = ws[f"{col}{total_row}"]
-                cell.font = Font(bold=True)
-                cell.alignment = Alignment(horizontal="right")
-                cell.number_format = numbers.FORMAT_CURRENCY_USD_SIMPLE
+            # Add total formulas (adjusted for new column positions)
+            cells = []
+            for formula in (f"=SUM(O2:O{max_row})",  # GP TOTAL (shifted from N to O)
+                            f"=SUM(P2:P{max_row})"):  # TOTAL SALE (shifted from O to P)
+                cell = WriteOnlyCell(ws, value=formula)
+                cell.font = _FONT_BOLD
+                cell.alignment = _ALIGN_RIGHT
+                cell.number_format = _CURRENCY_FMT
+                cells.append(cell)
+            ws.append([None] * 14 + cells)
             
             logger.info(f"Added totals row at row {total_row}")
             return total_row
             
         except Exception as e:
             additional_info = {
-                "worksheet_max_row": ws.max_row,
-                "calculated_total_row": max_row + 3 if 'max_row' in locals() else "N/A",
+                "last_data_row": max_row,
+                "calculated_total_row": max_row + 3,
                 "worksheet_name": ws.title if hasattr(ws, 'title') else "Unknown"
             }
             self.error_logger.log_error("Totals Row Addition", e, additional_info)
@@ -533,44 +620,46 @@ class BackorderReportGenerator:
         """Add color legend to worksheet."""
         try:
             legend_start = start_row + 3
-            thick_border = Border(
-                left=Side(border_style="thick", color="000000"),
-                right=Side(border_style="thick", color="000000"),
-                top=Side(border_style="thick", color="000000"),
-                bottom=Side(border_style="thick", color="000000")
-            )
+            
+            # Blank spacer rows between totals and legend
+            for _ in range(start_row + 1, legend_start):
+                ws.append([])
             
             # Legend headers
-            ws[f"A{legend_start}"] = "COLOR"
-            ws[f"B{legend_start}"] = "MEANING"
+            header_cells = []
+            for value in ("COLOR", "MEANING"):
+                cell = WriteOnlyCell(ws, value=value)
+                cell.font = _FONT_BOLD
+                cell.alignment = _ALIGN_CENTER
+                header_cells.append(cell)
+            ws.append(header_cells)
             
             # Merge B header with C,D,E,F and center
-            ws.merge_cells(f"B{legend_start}:F{legend_start}")
-            
-            for cell in [ws[f"A{legend_start}"], ws[f"B{legend_start}"]]:
-                cell.font = Font(bold=True)
-                cell.alignment = Alignment(horizontal="center")
+            ws.merged_cells.add(CellRange(min_col=2, min_row=legend_start, max_col=6, max_row=legend_start))
             
             # Legend entries
             for i, (color, meaning, hex_color) in enumerate(self.LEGEND_CONFIG, start=1):
                 row_num = legend_start + i
-                color_cell = ws[f"A{row_num}"]
-                meaning_cell = ws[f"B{row_num}"]
                 
                 # Set color cell properties
-                color_cell.value = color
-                color_cell.fill = PatternFill(start_color=hex_color, end_color=hex_color, fill_type="solid")
-                color_cell.alignment = Alignment(horizontal="center")
-                color_cell.border = thick_border
+                color_cell = WriteOnlyCell(ws, value=color)
+                color_cell.fill = self.LEGEND_FILLS[hex_color]
+                color_cell.alignment = _ALIGN_CENTER
+                color_cell.border = _BORDER_THICK
                 
-                # Merge meaning cell with columns C,D,E,F
-                ws.merge_cells(f"B{row_num}:F{row_num}")
-                meaning_cell.value = meaning
-                meaning_cell.alignment = Alignment(horizontal="center")
+                meaning_cell = WriteOnlyCell(ws, value=meaning)
+                meaning_cell.alignment = _ALIGN_CENTER
+                row_cells = [color_cell, meaning_cell]
                 
                 # Apply thick border to all cells in the merged range B,C,D,E,F
-                for col in ['B', 'C', 'D', 'E', 'F']:
-                    ws[f"{col}{row_num}"].border = thick_border
+                for _ in range(4):
+                    row_cells.append(WriteOnlyCell(ws))
+                for cell in row_cells[1:]:
+                    cell.border = _BORDER_THICK
+                ws.append(row_cells)
+                
+                # Merge meaning cell with columns C,D,E,F
+                ws.merged_cells.add(CellRange(min_col=2, min_row=row_num, max_col=6, max_row=row_num))
             
             logger.info(f"Added legend starting at row {legend_start}")
             
@@ -584,23 +673,21 @@ class BackorderReportGenerator:
             raise
     
     def create_sheet(self, wb: Workbook, title: str, data: pd.DataFrame) -> None:
-        """Create a worksheet with data and formatting."""
+        """Create a write-only worksheet and stream data and formatting into it."""
         try:
             logger.info(f"Creating sheet '{title}' with {len(data)} rows")
             
             ws = wb.create_sheet(title)
-            ws.append(self.HEADERS)
-            
-            if not data.empty:
-                self.add_data_to_sheet(ws, data)
             
-            self.format_sheet_headers(ws)
+            # Column and pane settings must be in place before rows are streamed
             self.set_column_widths(ws)
             ws.freeze_panes = "A2"
             
+            self.format_sheet_headers(ws)
+            
             if not data.empty:
-                self.add_formulas_and_formatting(ws)
-                total_row = self.add_totals_row(ws)
+                self.add_data_to_sheet(ws, data)
+                total_row = self.add_totals_row(ws, len(data) + 1)
                 self.add_legend(ws, total_row)
             
             logger.info(f"Successfully created sheet '{title}'")
@@ -624,17 +711,24 @@ class BackorderReportGenerator:
                 
             logger.info(f"Starting backorder report generation with sort column: {self.sort_column}")
             
-            self.validate_input_file()
-            
             # Load and process data
-            df = self.load_and_clean_data()
+            if self.df is None:
+                self.validate_input_file()
+                df = self.load_and_clean_data()
+            else:
+                logger.info(f"Using pre-loaded data for {self.input_file}")
+                df = self.df
+            total_rows = len(df)
             military_df, commercial_df = self.split_data_by_salesperson(df)
+            
+            # The split frames own their rows, so release the full frame before sorting and writing
+            del df
+            
             military_df, commercial_df = self.sort_dataframes(military_df, commercial_df)
             commercial_df = self.deduplicate_commercial_data(commercial_df)
             
-            # Create workbook
-            wb = Workbook()
-            wb.remove(wb.active)  # Remove default sheet
+            # Create write-only workbook (rows are streamed, no default sheet)
+            wb = Workbook(write_only=True)
             
             self.create_sheet(wb, "MILITARY", military_df)
             self.create_sheet(wb, "COMMERCIAL", commercial_df)
@@ -644,13 +738,18 @@ class BackorderReportGenerator:
                 output_file = output_file_path
             else:
                 output_file = f"BACKORDER REPORT {datetime.today().strftime('%m%d%y')}.xlsx"
-            wb.save(output_file)
+            
+            # Serialize in memory, then hit the disk with a single sequential write
+            buffer = io.BytesIO()
+            wb.save(buffer)
+            with open(output_file, "wb") as f:
+                f.write(buffer.getbuffer())
             
             logger.info(f"Report generated successfully: {output_file}")
             
             # Log summary
             logger.info(f"Report Summary:")
-            logger.info(f"  Total rows processed: {len(df)}")
+            logger.info(f"  Total rows processed: {total_rows}")
             logger.info(f"  Military orders: {len(military_df)}")
             logger.info(f"  Commercial orders: {len(commercial_df)}")
             logger.info(f"  Output file: {output_file}")
@@ -661,8 +760,8 @@ class BackorderReportGenerator:
         except Exception as e:
             additional_info = {
                 "input_file": self.input_file,
-                "current_working_directory": os.getcwd(),
-                "directory_listing": str(os.listdir('.'))[:500],
+                "current_working_directory": os.getcwd,
+                "directory_listing": lambda: str(os.listdir('.'))[:500],
                 "processing_stage": "Report Generation Main Process"
             }
             
@@ -694,7 +793,7 @@ def main():
         logger.info(f"Input file: {input_file}")
         logger.info(f"Start time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
-        generator = BackorderReportGenerator(input_file)
+        generator = BackorderReportGenerator(input_file, error_logger=error_logger)
         output_file = generator.generate_report()
         
         logger.info("="*60)
@@ -703,8 +802,8 @@ def main():
         print(f"✅ Report generated successfully: {output_file}")
         
         # Only mention error log if errors occurred
-        if generator.error_logger.has_errors:
-            print(f"⚠️  Errors occurred during processing - see {generator.error_logger.log_file} for details")
+        if error_logger.has_errors:
+            print(f"⚠️  Errors occurred during processing - see {error_logger.log_file} for details")
         else:
             logger.info("No errors occurred during processing - no error log created")
         
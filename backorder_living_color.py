@@ -1,6 +1,10 @@
+import io
 import os
+import re
+import numpy as np
 import pandas as pd
 from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import PatternFill, Font, Alignment, numbers
 from openpyxl.utils import get_column_letter
 from datetime import datetime, timedelta
@@ -8,25 +12,37 @@ from datetime import datetime, timedelta
 # --- CONFIGURABLES ---
 RAW_KEY_ORDER = ["ORDER #", "ITEM NO"]
 USER_COLS = ["PCX DOCK", "COMMENTS"]
+# ARGB colors; a 6-digit value gets a 00 (fully transparent) alpha from openpyxl
 COLOR_KEYWORDS = {
-    "PROCESS": "DEEAD0",
-    "PICKUP": "C5D9F1",
-    "ISSUE": "FFFF00",
-    "TESTING": "CCC0DA",
-    "SCHEDULED": "F2DCDB",
+    "PROCESS": "FFDEEAD0",
+    "PICKUP": "FFC5D9F1",
+    "ISSUE": "FFFFFF00",
+    "TESTING": "FFCCC0DA",
+    "SCHEDULED": "FFF2DCDB",
 }
+assert all(len(v) == 8 and v.startswith("FF") for v in COLOR_KEYWORDS.values()), "COLOR_KEYWORDS must be opaque ARGB (FFRRGGBB)"
+# Style objects are shared across every cell that uses them
+FILLS = {k: PatternFill(start_color=v, end_color=v, fill_type="solid") for k, v in COLOR_KEYWORDS.items()}
+HEADER_FONT = Font(bold=True)
+HEADER_ALIGN = Alignment(horizontal="center")
+CURRENCY_FMT = numbers.FORMAT_CURRENCY_USD_SIMPLE
+DATE_FMT = "MM-DD-YY"
+_KEYWORD_RE = re.compile("|".join(re.escape(k) for k in COLOR_KEYWORDS))
 
 REPORT_HEADERS = [
     "ORDER #", "CUST PO", "ORDER DATE", "PCX DOCK", "ITEM NO", "MFG", "HIP ASA", "UNIT PRICE", "UNIT COST",
     "CUST NAME", "SALESMAN NAME", "DUE DATE", "STOCK", "P.O. ALLOC.", "GP UNIT", "GP TOTAL", "TOTAL SALE", "COMMENTS"
 ]
+_COL_LETTERS = tuple(get_column_letter(i) for i in range(1, len(REPORT_HEADERS)+1))
+_COL_WIDTHS = tuple(max(12, len(col)+2) for col in REPORT_HEADERS)
 
 def find_previous_report(history_dir="report_history"):
     today = datetime.now()
     for delta in range(1, 8):  # look back up to 7 days
         prev_date = (today - timedelta(days=delta)).strftime("%m%d%y")
         for fname in os.listdir(history_dir):
-            if prev_date in fname and fname.lower().endswith(".xlsx"):
+            # Skip Excel's "~$" lock files left next to an open workbook
+            if prev_date in fname and fname.lower().endswith(".xlsx") and not fname.startswith("~$"):
                 return os.path.join(history_dir, fname)
     return None
 
@@ -35,12 +51,18 @@ def load_prev_userfields(prev_report_file):
     if not prev_report_file or not os.path.exists(prev_report_file):
         return pd.DataFrame()
     dfs = []
-    for sh in ["MILITARY", "COMMERCIAL"]:
-        try:
-            df = pd.read_excel(prev_report_file, sheet_name=sh)
-            dfs.append(df)
-        except Exception:
-            continue
+    # Open the workbook once for both sheets and parse only the key + user columns
+    try:
+        xls = pd.ExcelFile(prev_report_file)
+    except Exception:
+        return pd.DataFrame()
+    with xls:
+        for sh in ["MILITARY", "COMMERCIAL"]:
+            try:
+                df = xls.parse(sh, usecols=RAW_KEY_ORDER + USER_COLS)
+                dfs.append(df)
+            except Exception:
+                continue
     if not dfs:
         return pd.DataFrame()
     prev = pd.concat(dfs, axis=0, ignore_index=True)
@@ -48,12 +70,28 @@ def load_prev_userfields(prev_report_file):
         prev[col] = prev[col].astype(str).str.strip()
     # Only keep keys + user cols:
     prev = prev[RAW_KEY_ORDER + USER_COLS].drop_duplicates(RAW_KEY_ORDER, keep="last")
-    prev = prev.set_index(RAW_KEY_ORDER)
     return prev
 
-def color_row(ws, row_num, color_hex):
-    for col in range(1, ws.max_column+1):
-        ws.cell(row=row_num, column=col).fill = PatternFill(start_color=color_hex, end_color=color_hex, fill_type="solid")
+def comment_fills(comments):
+    # First keyword in COLOR_KEYWORDS order wins, matching anywhere in the comment
+    upper = comments.astype(str).str.upper()
+    fills = [None] * len(upper)
+    # One compiled-regex pass finds the commented rows; only those are ranked by keyword
+    hits = np.flatnonzero(upper.str.contains(_KEYWORD_RE).to_numpy())
+    matched = upper.iloc[hits]
+    conditions = [matched.str.contains(k, regex=False).to_numpy() for k in FILLS]
+    for i, k in zip(hits, np.select(conditions, list(FILLS), default="")):
+        fills[i] = FILLS[k]
+    return fills
+
+def parse_dates(values):
+    # One inferred-format pass; values in another format are retried one by one
+    parsed = pd.to_datetime(values, errors="coerce")
+    missed = parsed.isna() & values.notna()
+    if missed.any():
+        parsed[missed] = pd.to_datetime(values[missed], errors="coerce", format="mixed")
+    # Values that are not dates are kept as-is
+    return parsed.astype(object).where(parsed.notna(), values)
 
 def main(
     raw_data_file,
@@ -79,20 +117,19 @@ def main(
         "po_allc": "P.O. ALLOC.",  # Map po_allc to P.O. ALLOC. column
     }
     raw_df.columns = [c.strip().upper() for c in raw_df.columns]
-    for k, v in col_map.items():
-        if k.upper() in raw_df.columns:
-            raw_df.rename(columns={k.upper(): v}, inplace=True)
-    # Ensure all needed columns are there
-    for col in REPORT_HEADERS:
-        if col not in raw_df.columns:
-            if col in USER_COLS:
-                raw_df[col] = ""
-            else:
-                raw_df[col] = ""
+    raw_df = raw_df.rename(columns={k.upper(): v for k, v in col_map.items()})
+    # Ensure all needed columns are there, in export order, in a single allocation
+    raw_df = raw_df.reindex(columns=REPORT_HEADERS, fill_value="")
+    # Integer keys dedupe on the int64 hash path before the string cast; str() is
+    # one-to-one on integers, so the surviving rows are the same either way
+    int_keys = all(pd.api.types.is_integer_dtype(raw_df[col]) for col in RAW_KEY_ORDER)
+    if int_keys:
+        raw_df = raw_df.drop_duplicates(subset=RAW_KEY_ORDER)
     # Fix key columns as string type and strip
     for col in RAW_KEY_ORDER:
         raw_df[col] = raw_df[col].astype(str).str.strip()
-    raw_df = raw_df.drop_duplicates(subset=RAW_KEY_ORDER)
+    if not int_keys:
+        raw_df = raw_df.drop_duplicates(subset=RAW_KEY_ORDER)
 
     # --- Load previous report user fields ---
     prev_report = find_previous_report(history_dir)
@@ -100,17 +137,15 @@ def main(
 
     # --- Carry over PCX DOCK and COMMENTS ---
     if not prev_users.empty:
-        raw_df.set_index(RAW_KEY_ORDER, inplace=True)
-        for idx in raw_df.index:
-            if idx in prev_users.index:
-                for col in USER_COLS:
-                    val = prev_users.loc[idx, col]
-                    if pd.notna(val):
-                        raw_df.at[idx, col] = val
-        raw_df.reset_index(inplace=True)
+        # One hash join on the keys; a non-empty previous value wins
+        carried = raw_df[RAW_KEY_ORDER].merge(prev_users, on=RAW_KEY_ORDER, how="left")
+        carried.index = raw_df.index
+        for col in USER_COLS:
+            raw_df[col] = carried[col].where(carried[col].notna(), raw_df[col])
 
-    # --- Order columns for export ---
-    raw_df = raw_df[REPORT_HEADERS]
+    # Parse both date columns vectorized; values that are not dates are kept as-is
+    for colname in ["ORDER DATE", "DUE DATE"]:
+        raw_df[colname] = parse_dates(raw_df[colname])
 
     # --- Split MILITARY/COMMERCIAL ---
     is_military = raw_df["SALESMAN NAME"].str.upper() == "MANUEL ORTEGA"
@@ -120,46 +155,50 @@ def main(
     # --- Write to Excel with color coding ---
     if not output_file:
         output_file = f"BACKORDER REPORT {datetime.now().strftime('%m%d%y')}.xlsx"
-    wb = Workbook()
+    wb = Workbook(write_only=True)
+    currency_cols = range(7, 10)
+    date_cols = [REPORT_HEADERS.index(colname) for colname in ["ORDER DATE", "DUE DATE"]]
+    # Per-column number format, resolved once instead of per cell
+    number_formats = [
+        CURRENCY_FMT if c in currency_cols else DATE_FMT if c in date_cols else None
+        for c in range(len(REPORT_HEADERS))
+    ]
     for sheetname, df in [("MILITARY", military), ("COMMERCIAL", commercial)]:
         ws = wb.create_sheet(sheetname)
-        ws.append(REPORT_HEADERS)
-        # Write data
-        for r, (_, row) in enumerate(df.iterrows(), start=2):
-            ws.append(list(row))
-            # Color row if COMMENTS contains a keyword
-            comment = str(row["COMMENTS"]).upper()
-            for k, color in COLOR_KEYWORDS.items():
-                if k in comment:
-                    color_row(ws, r, color)
-                    break
-        # Header styling
-        for col in range(1, len(REPORT_HEADERS)+1):
-            cell = ws.cell(row=1, column=col)
-            cell.font = Font(bold=True)
-            cell.alignment = Alignment(horizontal="center")
-        # Currency formatting
-        for row in ws.iter_rows(min_row=2, max_row=ws.max_row, min_col=8, max_col=10):
-            for cell in row:
-                cell.number_format = numbers.FORMAT_CURRENCY_USD_SIMPLE
-        # Date formatting (ORDER DATE, DUE DATE)
-        for colname in ["ORDER DATE", "DUE DATE"]:
-            colnum = REPORT_HEADERS.index(colname) + 1
-            for row in range(2, ws.max_row+1):
-                cell = ws.cell(row=row, column=colnum)
-                if cell.value:
-                    try:
-                        cell.value = pd.to_datetime(cell.value).strftime("%m-%d-%y")
-                    except Exception:
-                        pass
-                cell.number_format = "MM-DD-YY"
-        # Set column widths
-        for i, col in enumerate(REPORT_HEADERS, start=1):
-            ws.column_dimensions[get_column_letter(i)].width = max(12, len(col)+2)
+        # Layout must be set before any rows are streamed out
+        for letter, width in zip(_COL_LETTERS, _COL_WIDTHS):
+            ws.column_dimensions[letter].width = width
         ws.freeze_panes = "A2"
-    # Remove default sheet
-    wb.remove(wb["Sheet"])
-    wb.save(output_file)
+        # Header styling
+        header_cells = []
+        for col in REPORT_HEADERS:
+            cell = WriteOnlyCell(ws, value=col)
+            cell.font = HEADER_FONT
+            cell.alignment = HEADER_ALIGN
+            header_cells.append(cell)
+        ws.append(header_cells)
+        # Write data
+        # Color row if COMMENTS contains a keyword
+        row_fills = comment_fills(df["COMMENTS"])
+        for row, fill in zip(df.itertuples(index=False, name=None), row_fills):
+            row_cells = []
+            for c, value in enumerate(row):
+                # Plain values go straight to openpyxl's row writer, which recycles one cell for them
+                if fill is None and not number_formats[c]:
+                    row_cells.append(value)
+                    continue
+                cell = WriteOnlyCell(ws, value=value)
+                if number_formats[c]:
+                    cell.number_format = number_formats[c]
+                if fill is not None:
+                    cell.fill = fill
+                row_cells.append(cell)
+            ws.append(row_cells)
+    # Serialize in memory, then hit the disk with a single sequential write
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    with open(output_file, "wb") as f:
+        f.write(buffer.getbuffer())
     print(f"Saved: {output_file}")
 
 if __name__ == "__main__":
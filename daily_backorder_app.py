@@ -7,7 +7,9 @@ Simple interface for generating daily backorder reports
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import threading
+import queue
 import os
+from collections import OrderedDict
 from datetime import datetime
 import sys
 
@@ -27,6 +29,12 @@ class BackorderReportApp:
         self.progress_var = tk.DoubleVar()
         self.status_var = tk.StringVar(value="Ready to generate report")
         
+        # Cleaned input frames keyed by (path, mtime, size), most recently used last
+        self._df_cache = OrderedDict()
+        
+        # Log lines and progress updates posted by the worker thread, applied on the Tk thread
+        self._pending_updates = queue.Queue()
+        
         # Sort By variables
         self.sort_by_order = tk.BooleanVar(value=True)  # Default to ORDER #
         self.sort_by_pcx_dock = tk.BooleanVar(value=False)
@@ -34,6 +42,7 @@ class BackorderReportApp:
         self.sort_by_due_date = tk.BooleanVar(value=False)
         
         self.setup_gui()
+        self.root.after(50, self.drain_updates)
         
     def setup_gui(self):
         """Setup the GUI interface"""
@@ -164,6 +173,7 @@ class BackorderReportApp:
         """Browse for input file"""
         file_types = [
             ("Excel files", "*.xlsx;*.xls"),
+            ("CSV files", "*.csv"),
             ("All files", "*.*")
         ]
         
@@ -176,23 +186,57 @@ class BackorderReportApp:
             self.input_file_path.set(filename)
             
     def log_message(self, message):
-        """Add message to output log"""
+        """Queue message for the output log"""
         timestamp = datetime.now().strftime("%H:%M:%S")
         formatted_message = f"[{timestamp}] {message}\n"
         
-        self.output_text.insert(tk.END, formatted_message)
-        self.output_text.see(tk.END)
-        self.root.update_idletasks()
+        self._pending_updates.put(("log", formatted_message))
+        
+    def drain_updates(self):
+        """Apply queued log lines, progress updates and the run's outcome in one batch"""
+        batch = []
+        progress = None
+        outcome = None
+        try:
+            while True:
+                kind, payload = self._pending_updates.get_nowait()
+                if kind == "log":
+                    batch.append(payload)
+                elif kind == "progress":
+                    progress = payload
+                else:
+                    outcome = (kind, payload)
+        except queue.Empty:
+            pass
+        
+        if batch:
+            self.output_text.insert(tk.END, "".join(batch))
+            self.output_text.see(tk.END)
+        
+        # Only the latest progress state matters
+        if progress is not None:
+            value, status = progress
+            self.progress_var.set(value)
+            self.status_var.set(status)
+        
+        self.root.after(50, self.drain_updates)
+        
+        # Dialogs are modal, so they are shown after the log is up to date
+        if outcome is not None:
+            kind, payload = outcome
+            self.generate_btn.config(state="normal")
+            if kind == "done":
+                messagebox.showinfo("Success", payload)
+            else:
+                messagebox.showerror("Error", payload)
         
     def clear_output(self):
         """Clear the output log"""
         self.output_text.delete(1.0, tk.END)
         
     def update_progress(self, value, status):
-        """Update progress bar and status"""
-        self.progress_var.set(value)
-        self.status_var.set(status)
-        self.root.update_idletasks()
+        """Queue progress bar and status update"""
+        self._pending_updates.put(("progress", (value, status)))
         
     def start_processing(self):
         """Start the report generation in a separate thread"""
@@ -211,8 +255,12 @@ class BackorderReportApp:
         # Disable button during processing
         self.generate_btn.config(state="disabled")
         
+        # Read the inputs here; the worker thread never touches Tk
+        sort_display, sort_column = self.get_sort_column()
+        args = (self.input_file_path.get(), self.output_file_path.get(), sort_display, sort_column)
+        
         # Start processing thread
-        processing_thread = threading.Thread(target=self.process_report)
+        processing_thread = threading.Thread(target=self.process_report, args=args)
         processing_thread.daemon = True
         processing_thread.start()
         
@@ -235,47 +283,64 @@ class BackorderReportApp:
         else:
             return ("ORDER #", "order_no")
     
-    def process_report(self):
+    def get_cached_data(self, input_file, sort_column):
+        """Load and clean the input file, reusing the result while the file is unchanged"""
+        stat = os.stat(input_file)
+        cache_key = (os.path.abspath(input_file), stat.st_mtime_ns, stat.st_size)
+        
+        df = self._df_cache.get(cache_key)
+        if df is not None:
+            self._df_cache.move_to_end(cache_key)
+            self.log_message("Using previously loaded data (file unchanged)")
+            return df
+        
+        loader = BackorderReportGenerator(input_file, sort_column=sort_column)
+        loader.validate_input_file()
+        df = loader.load_and_clean_data()
+        
+        self._df_cache[cache_key] = df
+        while len(self._df_cache) > 4:
+            self._df_cache.popitem(last=False)
+        return df
+        
+    def process_report(self, input_file, output_path, sort_display, sort_column):
         """Process the report generation"""
         try:
             self.log_message("Starting report generation...")
             self.update_progress(10, "Initializing...")
             
-            # Determine sort column
-            sort_display, sort_column = self.get_sort_column()
             self.log_message(f"Sorting by: {sort_display}")
             
-            # Create generator instance with sort column
-            generator = BackorderReportGenerator(self.input_file_path.get(), sort_column=sort_column)
-            
             self.update_progress(20, "Validating input file...")
-            self.log_message(f"Processing file: {self.input_file_path.get()}")
+            self.log_message(f"Processing file: {input_file}")
+            
+            # Reuse the parsed data when the same unchanged file is generated again
+            df = self.get_cached_data(input_file, sort_column)
+            
+            # Create generator instance with sort column
+            generator = BackorderReportGenerator(input_file, sort_column=sort_column, df=df)
             
             self.update_progress(50, "Generating report...")
             
             # Generate the report using your existing code with sort preference
-            output_file = generator.generate_report(self.output_file_path.get())
+            output_file = generator.generate_report(output_path)
             
             self.update_progress(100, "Report generated successfully!")
             self.log_message(f"✅ Report saved: {output_file}")
             self.log_message(f"📁 Location: {os.path.abspath(output_file)}")
             
-            # Show success message
-            messagebox.showinfo("Success", 
-                              f"Report generated successfully!\n\n"
-                              f"File: {output_file}\n"
-                              f"Location: {os.path.abspath(output_file)}\n"
-                              f"Sorted by: {sort_display}")
+            # Show success message and re-enable the button on the Tk thread
+            self._pending_updates.put(("done",
+                                       f"Report generated successfully!\n\n"
+                                       f"File: {output_file}\n"
+                                       f"Location: {os.path.abspath(output_file)}\n"
+                                       f"Sorted by: {sort_display}"))
             
         except Exception as e:
             error_msg = f"Error generating report: {str(e)}"
             self.log_message(f"❌ {error_msg}")
             self.update_progress(0, "Error occurred")
-            messagebox.showerror("Error", error_msg)
-            
-        finally:
-            # Re-enable button
-            self.generate_btn.config(state="normal")
+            self._pending_updates.put(("error", error_msg))
 
 def main():
     """Main function"""
@@ -6,11 +6,15 @@ import configparser
 import os
 import logging
 
+# Marks snapshot entries whose interpolation failed; they are resolved on read instead
+_DEFERRED = object()
+
 class Config:
     def __init__(self, config_file='config.ini'):
         self.config_file = config_file
         self.config = configparser.ConfigParser()
         self.logger = logging.getLogger(__name__)
+        self._values = {}
         
         # Load configuration
         self.load_config()
@@ -27,6 +31,27 @@ class Config:
         else:
             self.logger.info("Config file not found, creating default configuration")
             self._create_default_config()
+        
+        self._snapshot_values()
+            
+    def _snapshot_values(self):
+        """Flatten resolved values into a (section, key) dict for single-lookup reads"""
+        self._values = {}
+        for section in [self.config.default_section] + self.config.sections():
+            for key in self.config[section]:
+                try:
+                    self._values[(section, key)] = self.config.get(section, key)
+                except configparser.InterpolationError:
+                    # A bad value only fails when that key is read, not at startup
+                    self._values[(section, key)] = _DEFERRED
+                    
+    def _lookup(self, section, key):
+        """Return the snapshot value for a key, or None if it is not set"""
+        key = self.config.optionxform(key)
+        value = self._values.get((section, key))
+        if value is _DEFERRED:
+            value = self.config.get(section, key)
+        return value
             
     def _create_default_config(self):
         """Create default configuration"""
@@ -40,7 +65,8 @@ class Config:
             'validate_data': 'true',
             'remove_duplicates': 'false',
             'default_report_type': 'standard',
-            'include_charts': 'true'
+            'include_charts': 'true',
+            'cache_parsed_data': 'true'
         }
         
         self.config['EXCEL'] = {
@@ -70,23 +96,24 @@ class Config:
             
     def get(self, section, key, fallback=None):
         """Get configuration value"""
-        try:
-            return self.config.get(section, key)
-        except (configparser.NoSectionError, configparser.NoOptionError):
-            return fallback
+        value = self._lookup(section, key)
+        return fallback if value is None else value
             
     def getboolean(self, section, key, fallback=False):
         """Get boolean configuration value"""
-        try:
-            return self.config.getboolean(section, key)
-        except (configparser.NoSectionError, configparser.NoOptionError, ValueError):
+        value = self._lookup(section, key)
+        if value is None:
             return fallback
+        return self.config.BOOLEAN_STATES.get(value.lower(), fallback)
             
     def getint(self, section, key, fallback=0):
         """Get integer configuration value"""
+        value = self._lookup(section, key)
+        if value is None:
+            return fallback
         try:
-            return self.config.getint(section, key)
-        except (configparser.NoSectionError, configparser.NoOptionError, ValueError):
+            return int(value)
+        except ValueError:
             return fallback
             
     def set(self, section, key, value):
@@ -94,3 +121,4 @@ class Config:
         if not self.config.has_section(section):
             self.config.add_section(section)
         self.config.set(section, key, str(value))
+        self._snapshot_values()
@@ -5,14 +5,33 @@ Data Processing Module for Back Order Report Generator
 import pandas as pd
 import logging
 import os
+import glob
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import numpy as np
 
+# Optional: pyarrow provides pandas' multithreaded CSV parser and the
+# Parquet engine used for the parsed-data cache
+try:
+    import pyarrow  # noqa: F401
+    _HAS_PYARROW = True
+except ImportError:
+    _HAS_PYARROW = False
+
+# Columns that _clean_data_types turns into stripped strings
+_TEXT_COLUMNS = ('item_code', 'customer', 'supplier', 'category')
+
 class DataProcessor:
     def __init__(self, config):
         self.config = config
         self.logger = logging.getLogger(__name__)
         
+        # Keyword lists for the required columns, resolved once
+        self._required_keywords = [
+            (req_col, tuple(self._get_column_keywords(req_col)))
+            for req_col in ['item_code', 'quantity', 'order_date']
+        ]
+        
     def load_data(self, file_path, validate=True):
         """
         Load data from various file formats
@@ -28,25 +47,30 @@ class DataProcessor:
             raise FileNotFoundError(f"Input file not found: {file_path}")
             
         file_extension = os.path.splitext(file_path)[1].lower()
+        cache_path = self._cache_path(file_path)
         
         try:
-            if file_extension == '.csv':
-                data = pd.read_csv(file_path, encoding='utf-8')
-            elif file_extension in ['.xlsx', '.xls']:
-                data = pd.read_excel(file_path)
-            elif file_extension == '.txt':
-                # Try to determine delimiter
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    first_line = f.readline()
-                    if '\t' in first_line:
-                        delimiter = '\t'
-                    elif '|' in first_line:
-                        delimiter = '|'
-                    else:
-                        delimiter = ','
-                data = pd.read_csv(file_path, delimiter=delimiter, encoding='utf-8')
-            else:
-                raise ValueError(f"Unsupported file format: {file_extension}")
+            data = self._read_cache(file_path, cache_path)
+            if data is None:
+                if file_extension == '.csv':
+                    data = self._read_delimited(file_path, ',')
+                elif file_extension in ['.xlsx', '.xls']:
+                    data = pd.read_excel(file_path)
+                elif file_extension == '.txt':
+                    # Try to determine delimiter from the header line, read as bytes
+                    # and capped so a file without line breaks is not read whole
+                    with open(file_path, 'rb') as f:
+                        first_line = f.readline(64 * 1024)
+                        if b'\t' in first_line:
+                            delimiter = '\t'
+                        elif b'|' in first_line:
+                            delimiter = '|'
+                        else:
+                            delimiter = ','
+                    data = self._read_delimited(file_path, delimiter)
+                else:
+                    raise ValueError(f"Unsupported file format: {file_extension}")
+                self._write_cache(data, file_path, cache_path)
                 
             self.logger.info(f"Successfully loaded {len(data)} rows from {file_path}")
             
@@ -60,6 +84,83 @@ class DataProcessor:
             self.logger.error(error_msg)
             raise Exception(error_msg)
             
+    def _cache_path(self, file_path):
+        """
+        Parquet cache location for a parsed input file, keyed by its
+        modification time and size so any change to the file misses the cache
+        
+        Returns:
+            str: Cache file path, or None when caching is unavailable or disabled
+        """
+        if not _HAS_PYARROW or not self.config.getboolean('PROCESSING', 'cache_parsed_data', fallback=True):
+            return None
+            
+        stat = os.stat(file_path)
+        return f"{file_path}.{stat.st_mtime_ns}-{stat.st_size}.parquet"
+        
+    def _read_cache(self, file_path, cache_path):
+        """
+        Load the cached parse of a file
+        
+        Returns:
+            pandas.DataFrame: Cached data, or None when there is no usable cache;
+            an unreadable cache file is deleted so the source is parsed again
+        """
+        if not cache_path or not os.path.exists(cache_path):
+            return None
+            
+        try:
+            data = pd.read_parquet(cache_path, engine='pyarrow')
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable cache for {file_path}: {e}")
+            try:
+                os.remove(cache_path)
+            except OSError:
+                pass
+            return None
+            
+        self.logger.info(f"Using cached parse of {file_path}")
+        return data
+        
+    def _write_cache(self, data, file_path, cache_path):
+        """Store the raw parsed frame as Parquet and drop caches of older versions of the file"""
+        if not cache_path:
+            return
+            
+        # Write to a temporary file and move it into place, so an interrupted
+        # write never leaves a partial cache under the final name
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            data.to_parquet(temp_path, engine='pyarrow', compression='zstd')
+            os.replace(temp_path, cache_path)
+        except Exception as e:
+            self.logger.warning(f"Could not cache parsed data for {file_path}: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+            
+        for stale in glob.glob(f"{glob.escape(file_path)}.*-*.parquet"):
+            if stale != cache_path:
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+                    
+    def _read_delimited(self, file_path, delimiter):
+        """Read a delimited text file, using the pyarrow parser when it is installed"""
+        # Text columns end up as strings anyway, so read them as strings and skip
+        # type inference for them; the header alone tells which columns they are
+        header = pd.read_csv(file_path, delimiter=delimiter, encoding='utf-8', nrows=0).columns
+        dtype = {col: str for col in header
+                 if str(col).strip().lower().replace(' ', '_') in _TEXT_COLUMNS}
+        
+        if _HAS_PYARROW:
+            try:
+                return pd.read_csv(file_path, delimiter=delimiter, encoding='utf-8', dtype=dtype, engine='pyarrow')
+            except Exception as e:
+                self.logger.warning(f"pyarrow CSV parser failed ({e}), falling back to the default parser")
+        return pd.read_csv(file_path, delimiter=delimiter, encoding='utf-8', dtype=dtype)
+        
     def _validate_data(self, data):
         """
         Validate and clean the input data
@@ -80,36 +181,34 @@ class DataProcessor:
         # Standardize column names (remove spaces, convert to lowercase)
         data.columns = data.columns.str.strip().str.lower().str.replace(' ', '_')
         
-        # Required columns for back order reports
-        required_columns = ['item_code', 'quantity', 'order_date']
-        optional_columns = ['customer', 'supplier', 'expected_date', 'unit_price', 'category']
-        
-        # Check for required columns (flexible matching)
+        # Check for required columns (flexible matching): a single pass over the
+        # columns gives each required column its first keyword match
         column_mapping = {}
-        for req_col in required_columns:
-            found = False
-            for col in data.columns:
-                if any(keyword in col for keyword in self._get_column_keywords(req_col)):
+        for col in data.columns:
+            for req_col, keywords in self._required_keywords:
+                if req_col not in column_mapping and any(keyword in col for keyword in keywords):
                     column_mapping[req_col] = col
-                    found = True
-                    break
-            if not found:
+            if len(column_mapping) == len(self._required_keywords):
+                break
+                
+        for req_col, _ in self._required_keywords:
+            if req_col not in column_mapping:
                 raise ValueError(f"Required column '{req_col}' not found in input data. "
                                f"Available columns: {list(data.columns)}")
         
         # Rename columns to standard names
         data = data.rename(columns=column_mapping)
         
-        # Remove completely empty rows
-        data = data.dropna(how='all')
+        # Completely empty rows, found before cleaning turns missing text into strings
+        non_empty = data.notna().any(axis=1).to_numpy()
         
         # Validate data types and handle missing values
         data = self._clean_data_types(data)
         
-        # Remove invalid records
-        initial_count = len(data)
-        data = data[data['quantity'] > 0]  # Remove zero or negative quantities
-        data = data.dropna(subset=['item_code'])  # Remove rows without item codes
+        # Remove empty rows, zero or negative quantities and rows without item codes
+        # with one combined mask, so the frame is copied once
+        valid = non_empty & (data['quantity'] > 0).to_numpy() & data['item_code'].notna().to_numpy()
+        data = data.loc[valid]
         
         if len(data) == 0:
             raise ValueError("No valid records found after data validation")
@@ -154,10 +253,15 @@ class DataProcessor:
             data['unit_price'] = pd.to_numeric(data['unit_price'], errors='coerce')
             
         # Clean text fields
-        text_columns = ['item_code', 'customer', 'supplier', 'category']
-        for col in text_columns:
+        for col in _TEXT_COLUMNS:
             if col in data.columns:
-                data[col] = data[col].astype(str).str.strip()
+                values = data[col].astype(str)
+                if _HAS_PYARROW:
+                    # Arrow-backed strings strip in pyarrow compute instead of a per-object loop.
+                    # NaN as the missing value keeps blanks as they were; 'string[pyarrow]'
+                    # would turn them into pd.NA, which openpyxl cannot write
+                    values = values.astype(pd.StringDtype('pyarrow', na_value=np.nan))
+                data[col] = values.str.strip()
                 
         return data
         
@@ -175,95 +279,138 @@ class DataProcessor:
         
         processed_data = {}
         
-        # Summary statistics
-        processed_data['summary'] = self._generate_summary(data)
+        # Item codes are factorized once; every distinct-item count then hashes
+        # small integers instead of strings
+        analysis_data = data.assign(_item_id=self._item_ids(data['item_code']))
         
-        # Back order analysis by item
-        processed_data['by_item'] = self._analyze_by_item(data)
+        # Summary statistics and back order analysis by item
+        analyses = [
+            ('summary', self._generate_summary),
+            ('by_item', self._analyze_by_item),
+        ]
         
         # Back order analysis by customer (if available)
         if 'customer' in data.columns:
-            processed_data['by_customer'] = self._analyze_by_customer(data)
+            analyses.append(('by_customer', self._analyze_by_customer))
             
         # Back order analysis by supplier (if available)
         if 'supplier' in data.columns:
-            processed_data['by_supplier'] = self._analyze_by_supplier(data)
+            analyses.append(('by_supplier', self._analyze_by_supplier))
             
         # Time-based analysis
         if 'order_date' in data.columns:
-            processed_data['by_date'] = self._analyze_by_date(data)
+            analyses.append(('by_date', self._analyze_by_date))
             
         # Category analysis (if available)
         if 'category' in data.columns:
-            processed_data['by_category'] = self._analyze_by_category(data)
+            analyses.append(('by_category', self._analyze_by_category))
             
         # Aging analysis
-        processed_data['aging'] = self._analyze_aging(data)
-        
-        # Raw data for detailed view
+        analyses.append(('aging', self._analyze_aging))
+        
+        # The analyses only read analysis_data and spend most of their time in
+        # pandas/NumPy kernels that release the GIL, so they run side by side
+        with ThreadPoolExecutor(max_workers=min(len(analyses), os.cpu_count() or 1)) as executor:
+            futures = [(key, executor.submit(analyze, analysis_data)) for key, analyze in analyses]
+            for key, future in futures:
+                processed_data[key] = future.result()
+                
+        # Raw data for detailed view, with line values added to a new frame so the
+        # caller's data is left untouched
+        if 'unit_price' in data.columns:
+            data = data.assign(total_value=data['quantity'] * data['unit_price'])
         processed_data['raw_data'] = data
         
         self.logger.info("Data processing completed")
         return processed_data
         
+    def _item_ids(self, item_codes):
+        """
+        Integer id per item code, missing codes stay missing so nunique skips them
+        
+        Args:
+            item_codes (pandas.Series): Item code column
+            
+        Returns:
+            pandas.arrays.IntegerArray: int32 ids aligned with item_codes
+        """
+        codes = pd.factorize(item_codes)[0].astype(np.int32)
+        return pd.arrays.IntegerArray(codes, codes < 0)
+        
     def _generate_summary(self, data):
         """Generate summary statistics"""
         summary = {
             'total_items': len(data),
-            'unique_items': data['item_code'].nunique(),
+            'unique_items': data['_item_id'].nunique(),
             'total_quantity': data['quantity'].sum(),
             'avg_quantity': data['quantity'].mean(),
         }
         
         if 'unit_price' in data.columns:
-            data['total_value'] = data['quantity'] * data['unit_price']
-            summary['total_value'] = data['total_value'].sum()
-            summary['avg_value'] = data['total_value'].mean()
+            # Line values on the raw arrays, skipping missing prices like Series.sum/mean
+            quantity = data['quantity'].to_numpy(dtype=float, na_value=np.nan)
+            unit_price = data['unit_price'].to_numpy(dtype=float, na_value=np.nan)
+            line_values = quantity * unit_price
+            line_values = line_values[~np.isnan(line_values)]
+            summary['total_value'] = float(line_values.sum())
+            summary['avg_value'] = float(line_values.mean()) if len(line_values) else np.nan
             
         if 'customer' in data.columns:
             summary['unique_customers'] = data['customer'].nunique()
             
         return summary
         
-    def _analyze_by_item(self, data):
-        """Analyze back orders by item"""
-        by_item = data.groupby('item_code').agg({
-            'quantity': ['sum', 'count', 'mean'],
-            'order_date': ['min', 'max'] if 'order_date' in data.columns else None
-        }).round(2)
+    def _grouped_aggs(self, data, key, named_aggs, sort_by=None):
+        """
+        Group by one key and run all of its aggregations in a single agg call
         
-        # Flatten column names
-        by_item.columns = ['_'.join(col).strip() if col[1] else col[0] for col in by_item.columns]
-        by_item = by_item.reset_index()
-        by_item = by_item.sort_values('quantity_sum', ascending=False)
+        Args:
+            data (pandas.DataFrame): Validated input data
+            key (str or pandas.Series): Column name or key series to group by
+            named_aggs (dict): Output column -> (input column, aggregation function)
+            sort_by (str): Optional result column to sort descending on
+            
+        Returns:
+            pandas.DataFrame: One row per group
+        """
+        # observed=True keeps categorical keys from expanding to unused categories;
+        # key order is only needed when no explicit sort follows
+        grouped = data.groupby(key, observed=True, sort=sort_by is None).agg(**named_aggs).round(2)
+        
+        grouped = grouped.reset_index()
+        if sort_by:
+            grouped = grouped.sort_values(sort_by, ascending=False)
+            
+        return grouped
         
-        return by_item
+    def _analyze_by_item(self, data):
+        """Analyze back orders by item"""
+        named_aggs = {
+            'quantity_sum': ('quantity', 'sum'),
+            'quantity_count': ('quantity', 'count'),
+            'quantity_mean': ('quantity', 'mean'),
+        }
+        if 'order_date' in data.columns:
+            named_aggs['order_date_min'] = ('order_date', 'min')
+            named_aggs['order_date_max'] = ('order_date', 'max')
+            
+        return self._grouped_aggs(data, 'item_code', named_aggs, sort_by='quantity_sum')
         
     def _analyze_by_customer(self, data):
         """Analyze back orders by customer"""
-        by_customer = data.groupby('customer').agg({
-            'quantity': ['sum', 'count'],
-            'item_code': 'nunique'
-        }).round(2)
-        
-        by_customer.columns = ['_'.join(col).strip() for col in by_customer.columns]
-        by_customer = by_customer.reset_index()
-        by_customer = by_customer.sort_values('quantity_sum', ascending=False)
-        
-        return by_customer
+        return self._grouped_aggs(data, 'customer', {
+            'quantity_sum': ('quantity', 'sum'),
+            'quantity_count': ('quantity', 'count'),
+            'item_code_nunique': ('_item_id', 'nunique'),
+        }, sort_by='quantity_sum')
         
     def _analyze_by_supplier(self, data):
         """Analyze back orders by supplier"""
-        by_supplier = data.groupby('supplier').agg({
-            'quantity': ['sum', 'count'],
-            'item_code': 'nunique'
-        }).round(2)
-        
-        by_supplier.columns = ['_'.join(col).strip() for col in by_supplier.columns]
-        by_supplier = by_supplier.reset_index()
-        by_supplier = by_supplier.sort_values('quantity_sum', ascending=False)
-        
-        return by_supplier
+        return self._grouped_aggs(data, 'supplier', {
+            'quantity_sum': ('quantity', 'sum'),
+            'quantity_count': ('quantity', 'count'),
+            'item_code_nunique': ('_item_id', 'nunique'),
+        }, sort_by='quantity_sum')
         
     def _analyze_by_date(self, data):
         """Analyze back orders by date"""
@@ -274,30 +421,24 @@ class DataProcessor:
         date_data = data.dropna(subset=['order_date'])
         
         # Group by month
-        date_data['year_month'] = date_data['order_date'].dt.to_period('M')
-        by_date = date_data.groupby('year_month').agg({
-            'quantity': ['sum', 'count'],
-            'item_code': 'nunique'
-        }).round(2)
-        
-        by_date.columns = ['_'.join(col).strip() for col in by_date.columns]
-        by_date = by_date.reset_index()
+        year_month = date_data['order_date'].dt.to_period('M').rename('year_month')
+        by_date = self._grouped_aggs(date_data, year_month, {
+            'quantity_sum': ('quantity', 'sum'),
+            'quantity_count': ('quantity', 'count'),
+            'item_code_nunique': ('_item_id', 'nunique'),
+        })
         by_date['year_month'] = by_date['year_month'].astype(str)
         
         return by_date
         
     def _analyze_by_category(self, data):
         """Analyze back orders by category"""
-        by_category = data.groupby('category').agg({
-            'quantity': ['sum', 'count', 'mean'],
-            'item_code': 'nunique'
-        }).round(2)
-        
-        by_category.columns = ['_'.join(col).strip() for col in by_category.columns]
-        by_category = by_category.reset_index()
-        by_category = by_category.sort_values('quantity_sum', ascending=False)
-        
-        return by_category
+        return self._grouped_aggs(data, 'category', {
+            'quantity_sum': ('quantity', 'sum'),
+            'quantity_count': ('quantity', 'count'),
+            'quantity_mean': ('quantity', 'mean'),
+            'item_code_nunique': ('_item_id', 'nunique'),
+        }, sort_by='quantity_sum')
         
     def _analyze_aging(self, data):
         """Analyze aging of back orders"""
@@ -305,20 +446,42 @@ class DataProcessor:
             return pd.DataFrame()
             
         current_date = datetime.now()
-        date_data = data.dropna(subset=['order_date']).copy()
-        date_data['days_old'] = (current_date - date_data['order_date']).dt.days
-        
-        # Create aging buckets
-        bins = [0, 7, 14, 30, 60, 90, float('inf')]
-        labels = ['0-7 days', '8-14 days', '15-30 days', '31-60 days', '61-90 days', '90+ days']
-        date_data['age_bucket'] = pd.cut(date_data['days_old'], bins=bins, labels=labels, right=False)
-        
-        aging = date_data.groupby('age_bucket').agg({
-            'quantity': ['sum', 'count'],
-            'item_code': 'nunique'
+        date_data = data.dropna(subset=['order_date'])
+        order_dates = date_data['order_date'].to_numpy().astype('datetime64[ns]')
+        days_old = (np.datetime64(current_date, 'ns') - order_dates) // np.timedelta64(1, 'D')
+        
+        # Create aging buckets: index of the first upper edge above days_old,
+        # future-dated orders (negative age) fall outside every bucket
+        edges = np.array([7, 14, 30, 60, 90])
+        labels = np.array(['0-7 days', '8-14 days', '15-30 days', '31-60 days', '61-90 days', '90+ days'])
+        in_range = days_old >= 0
+        date_data = date_data[in_range]
+        bucket_idx = np.searchsorted(edges, days_old[in_range], side='right')
+        n_buckets = len(labels)
+        
+        # Six fixed buckets: per-bucket totals are bincounts, skipping missing values
+        # the way groupby sum/count/nunique do
+        quantity = date_data['quantity'].to_numpy(dtype=float, na_value=np.nan)
+        has_quantity = ~np.isnan(quantity)
+        quantity_sum = np.bincount(bucket_idx[has_quantity], weights=quantity[has_quantity], minlength=n_buckets)
+        quantity_count = np.bincount(bucket_idx[has_quantity], minlength=n_buckets)
+        if pd.api.types.is_integer_dtype(date_data['quantity']):
+            quantity_sum = quantity_sum.astype(date_data['quantity'].dtype)
+            
+        # Distinct items per bucket: unique (bucket, item) pairs counted per bucket
+        item_ids = date_data['_item_id'].to_numpy(dtype=np.int64, na_value=-1)
+        has_item = item_ids >= 0
+        n_items = int(item_ids.max()) + 1 if has_item.any() else 1
+        pairs = np.unique(bucket_idx[has_item] * n_items + item_ids[has_item])
+        item_code_nunique = np.bincount(pairs // n_items, minlength=n_buckets)
+        
+        # Only buckets with orders are reported
+        present = np.bincount(bucket_idx, minlength=n_buckets) > 0
+        aging = pd.DataFrame({
+            'age_bucket': labels[present],
+            'quantity_sum': quantity_sum[present],
+            'quantity_count': quantity_count[present],
+            'item_code_nunique': item_code_nunique[present],
         }).round(2)
         
-        aging.columns = ['_'.join(col).strip() for col in aging.columns]
-        aging = aging.reset_index()
-        
         return aging
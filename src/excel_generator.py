@@ -4,8 +4,11 @@ Excel Report Generation Module
 
 import pandas as pd
 import openpyxl
-from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
+from openpyxl.cell import Cell, WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Border, Side, Alignment, NamedStyle
+from openpyxl.styles.fonts import DEFAULT_FONT
 from openpyxl.chart import BarChart, PieChart, LineChart, Reference
+from openpyxl.utils import get_column_letter
 from openpyxl.utils.dataframe import dataframe_to_rows
 import logging
 from datetime import datetime
@@ -17,6 +20,10 @@ class ExcelGenerator:
         
         # Define styling
         self.header_font = Font(bold=True, color="FFFFFF")
+        self.report_title_font = Font(size=16, bold=True)
+        self.sheet_title_font = Font(size=14, bold=True)
+        self.section_title_font = Font(bold=True, size=12)
+        self.chart_title_font = Font(bold=True)
         self.header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
         self.border = Border(
             left=Side(style='thin'),
@@ -25,6 +32,12 @@ class ExcelGenerator:
             bottom=Side(style='thin')
         )
         
+        # Table styles, registered on each workbook so cells reference them by name
+        self.header_style = NamedStyle(name='bo_header', font=self.header_font, fill=self.header_fill,
+                                       border=self.border, alignment=Alignment(horizontal='center'))
+        # Body cells use the workbook's default Calibri 11 font rather than an empty <font/>
+        self.body_style = NamedStyle(name='bo_body', font=DEFAULT_FONT, border=self.border)
+        
     def generate_report(self, processed_data, output_path, report_type="standard", include_charts=True):
         """
         Generate Excel report with multiple sheets
@@ -38,11 +51,14 @@ class ExcelGenerator:
         try:
             self.logger.info(f"Generating {report_type} Excel report")
             
-            # Create workbook
-            wb = openpyxl.Workbook()
+            # Create a write-only workbook: rows are streamed to the file as they
+            # are appended instead of being kept as an in-memory cell grid
+            wb = openpyxl.Workbook(write_only=True)
+            wb.add_named_style(self.header_style)
+            wb.add_named_style(self.body_style)
             
-            # Remove the default worksheet that is created
-            wb.remove(wb.worksheets[0])
+            # One generation timestamp shared by every sheet of this report
+            self._generated_on = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             
             # Generate sheets based on report type
             if report_type == "summary":
@@ -68,31 +84,26 @@ class ExcelGenerator:
         ws = wb.create_sheet("Summary")
         
         # Title
-        ws['A1'] = "Back Order Report Summary"
-        ws['A1'].font = Font(size=16, bold=True)
-        ws['A2'] = f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        rows = self._title_rows(ws, "Back Order Report Summary", font=self.report_title_font)
         
         # Summary statistics
-        row = 4
         summary = data.get('summary', {})
         
         for key, value in summary.items():
-            ws[f'A{row}'] = key.replace('_', ' ').title()
-            ws[f'B{row}'] = value
-            row += 1
+            rows.append([self._bordered_cell(ws, key.replace('_', ' ').title()),
+                         self._bordered_cell(ws, value)])
             
-        # Format summary section
-        self._format_range(ws, f'A4:B{row-1}')
-        
         # Top items by quantity
         if 'by_item' in data:
-            row += 2
-            ws[f'A{row}'] = "Top 10 Items by Quantity"
-            ws[f'A{row}'].font = Font(bold=True, size=12)
-            row += 1
+            title = WriteOnlyCell(ws, value="Top 10 Items by Quantity")
+            title.font = self.section_title_font
+            rows += [[], [], [title]]
             
             top_items = data['by_item'].head(10)
-            self._write_dataframe(ws, top_items, start_row=row)
+            self._write_dataframe(ws, top_items, preamble=rows)
+        else:
+            for row in rows:
+                ws.append(row)
             
     def _create_standard_sheets(self, wb, data, include_charts):
         """Create standard report sheets"""
@@ -137,78 +148,52 @@ class ExcelGenerator:
         """Create by item analysis sheet"""
         ws = wb.create_sheet("By Item")
         
-        ws['A1'] = "Back Orders by Item"
-        ws['A1'].font = Font(size=14, bold=True)
-        ws['A2'] = f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-        
-        self._write_dataframe(ws, data, start_row=4)
+        self._write_dataframe(ws, data, preamble=self._title_rows(ws, "Back Orders by Item"))
         
     def _create_by_customer_sheet(self, wb, data):
         """Create by customer analysis sheet"""
         ws = wb.create_sheet("By Customer")
         
-        ws['A1'] = "Back Orders by Customer"
-        ws['A1'].font = Font(size=14, bold=True)
-        ws['A2'] = f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-        
-        self._write_dataframe(ws, data, start_row=4)
+        self._write_dataframe(ws, data, preamble=self._title_rows(ws, "Back Orders by Customer"))
         
     def _create_by_supplier_sheet(self, wb, data):
         """Create by supplier analysis sheet"""
         ws = wb.create_sheet("By Supplier")
         
-        ws['A1'] = "Back Orders by Supplier"
-        ws['A1'].font = Font(size=14, bold=True)
-        ws['A2'] = f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-        
-        self._write_dataframe(ws, data, start_row=4)
+        self._write_dataframe(ws, data, preamble=self._title_rows(ws, "Back Orders by Supplier"))
         
     def _create_by_date_sheet(self, wb, data):
         """Create by date analysis sheet"""
         ws = wb.create_sheet("By Date")
         
-        ws['A1'] = "Back Orders by Month"
-        ws['A1'].font = Font(size=14, bold=True)
-        ws['A2'] = f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-        
-        self._write_dataframe(ws, data, start_row=4)
+        self._write_dataframe(ws, data, preamble=self._title_rows(ws, "Back Orders by Month"))
         
     def _create_by_category_sheet(self, wb, data):
         """Create by category analysis sheet"""
         ws = wb.create_sheet("By Category")
         
-        ws['A1'] = "Back Orders by Category"
-        ws['A1'].font = Font(size=14, bold=True)
-        ws['A2'] = f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-        
-        self._write_dataframe(ws, data, start_row=4)
+        self._write_dataframe(ws, data, preamble=self._title_rows(ws, "Back Orders by Category"))
         
     def _create_aging_sheet(self, wb, data):
         """Create aging analysis sheet"""
         ws = wb.create_sheet("Aging Analysis")
         
-        ws['A1'] = "Back Order Aging Analysis"
-        ws['A1'].font = Font(size=14, bold=True)
-        ws['A2'] = f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-        
-        self._write_dataframe(ws, data, start_row=4)
+        self._write_dataframe(ws, data, preamble=self._title_rows(ws, "Back Order Aging Analysis"))
         
     def _create_raw_data_sheet(self, wb, data):
         """Create raw data sheet"""
         ws = wb.create_sheet("Raw Data")
         
-        ws['A1'] = "Raw Back Order Data"
-        ws['A1'].font = Font(size=14, bold=True)
-        ws['A2'] = f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-        
-        self._write_dataframe(ws, data, start_row=4)
+        self._write_dataframe(ws, data, preamble=self._title_rows(ws, "Raw Back Order Data"))
         
     def _create_charts_sheet(self, wb, data):
         """Create charts and visualizations sheet"""
         ws = wb.create_sheet("Charts")
         
-        ws['A1'] = "Back Order Analysis Charts"
-        ws['A1'].font = Font(size=14, bold=True)
+        title = WriteOnlyCell(ws, value="Back Order Analysis Charts")
+        title.font = self.sheet_title_font
+        ws.append([title])
+        ws.append([])
         
         chart_row = 3
         
@@ -227,63 +212,100 @@ class ExcelGenerator:
             self._add_pie_chart(ws, data['aging'], 'age_bucket', 'quantity_sum',
                               "Back Orders by Age", chart_row)
                               
-    def _write_dataframe(self, ws, df, start_row=1):
-        """Write dataframe to worksheet with formatting"""
+    def _title_rows(self, ws, title, font=None):
+        """Title, generation timestamp and spacer rows that open a sheet"""
+        title_cell = WriteOnlyCell(ws, value=title)
+        title_cell.font = font or self.sheet_title_font
+        return [
+            [title_cell],
+            [f"Generated on: {self._generated_on}"],
+            [],
+        ]
+        
+    def _bordered_cell(self, ws, value=None):
+        """Write-only cell with the thin table border"""
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = 'bo_body'
+        return cell
+        
+    def _write_dataframe(self, ws, df, preamble=()):
+        """
+        Write dataframe to worksheet with formatting
+        
+        Args:
+            ws: Write-only worksheet
+            df (pandas.DataFrame): Table to write
+            preamble (list): Rows (values or cells) written above the table
+        """
         if df.empty:
-            ws[f'A{start_row}'] = "No data available"
+            for row in preamble:
+                ws.append(row)
+            ws.append(["No data available"])
             return
             
+        headers = [str(column).replace('_', ' ').title() for column in df.columns]
+        
+        # Auto-adjust column widths from per-column maxima of the preamble and the
+        # table; write-only sheets need them set before the first row is appended
+        max_lengths = {}
+        for row in preamble:
+            for col_idx, item in enumerate(row, 1):
+                value = item.value if isinstance(item, Cell) else item
+                if value is not None:
+                    max_lengths[col_idx] = max(max_lengths.get(col_idx, 0), len(str(value)))
+                    
+        for col_idx, (column, header) in enumerate(zip(df.columns, headers), 1):
+            if pd.api.types.is_datetime64_any_dtype(df[column]):
+                # Cells hold datetimes, which print as 'YYYY-MM-DD HH:MM:SS'
+                data_length = 19 if df[column].notna().any() else 3
+            else:
+                data_length = df[column].astype(str).str.len().max()
+            max_lengths[col_idx] = max(max_lengths.get(col_idx, 0), len(header), int(data_length))
+            
+        for col_idx, max_length in max_lengths.items():
+            ws.column_dimensions[get_column_letter(col_idx)].width = min(max_length + 2, 50)
+            
+        for row in preamble:
+            ws.append(row)
+            
         # Write headers
-        for col_idx, column in enumerate(df.columns, 1):
-            cell = ws.cell(row=start_row, column=col_idx, value=str(column).replace('_', ' ').title())
-            cell.font = self.header_font
-            cell.fill = self.header_fill
-            cell.border = self.border
-            cell.alignment = Alignment(horizontal='center')
-            
-        # Write data
-        for row_idx, row in enumerate(df.itertuples(index=False), start_row + 1):
-            for col_idx, value in enumerate(row, 1):
-                cell = ws.cell(row=row_idx, column=col_idx, value=value)
-                cell.border = self.border
-                
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-            
-    def _format_range(self, ws, range_str):
-        """Apply formatting to a range of cells"""
-        for row in ws[range_str]:
-            for cell in row:
-                cell.border = self.border
-                
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.style = 'bo_header'
+            header_cells.append(cell)
+        ws.append(header_cells)
+        
+        # Write data: append serializes the row immediately, so one bordered
+        # cell per column is re-filled for every row
+        row_cells = [self._bordered_cell(ws) for _ in df.columns]
+        for row in df.itertuples(index=False, name=None):
+            for cell, value in zip(row_cells, row):
+                cell.value = value
+            ws.append(row_cells)
+            
+    def _chart_data_rows(self, ws, data, category_col, value_col, title):
+        """Title, blank, header and data rows that a chart's references point at"""
+        title_cell = WriteOnlyCell(ws, value=title)
+        title_cell.font = self.chart_title_font
+        rows = [
+            [title_cell],
+            [],
+            [category_col.replace('_', ' ').title(), value_col.replace('_', ' ').title()],
+        ]
+        rows += [list(row) for row in data[[category_col, value_col]].itertuples(index=False, name=None)]
+        return rows
+        
     def _add_bar_chart(self, ws, data, category_col, value_col, title, start_row, top_n=10):
-        """Add a bar chart to the worksheet"""
+        """
+        Add a bar chart to the worksheet; rows are appended from start_row on,
+        padded to the fixed block height so the next chart starts at the returned row
+        """
         try:
             # Get top N items
             chart_data = data.head(top_n)
-            
-            # Write chart data to worksheet
             data_start_row = start_row + 2
-            ws.cell(row=start_row, column=1, value=title).font = Font(bold=True)
-            
-            # Headers
-            ws.cell(row=data_start_row, column=1, value=category_col.replace('_', ' ').title())
-            ws.cell(row=data_start_row, column=2, value=value_col.replace('_', ' ').title())
-            
-            # Data
-            for idx, row in enumerate(chart_data.itertuples(index=False), data_start_row + 1):
-                ws.cell(row=idx, column=1, value=getattr(row, category_col))
-                ws.cell(row=idx, column=2, value=getattr(row, value_col))
+            rows = self._chart_data_rows(ws, chart_data, category_col, value_col, title)
                 
             # Create chart
             chart = BarChart()
@@ -303,27 +325,25 @@ class ExcelGenerator:
             # Position chart
             ws.add_chart(chart, f'D{start_row}')
             
-            return start_row + 20
+            block_height = 20
             
         except Exception as e:
             self.logger.warning(f"Failed to create bar chart: {str(e)}")
-            return start_row + 5
+            rows = []
+            block_height = 5
+            
+        # Write chart data to worksheet
+        rows += [[]] * (block_height - len(rows))
+        for row in rows:
+            ws.append(row)
+            
+        return start_row + block_height
             
     def _add_pie_chart(self, ws, data, category_col, value_col, title, start_row):
-        """Add a pie chart to the worksheet"""
+        """Add a pie chart to the worksheet; its rows are appended from start_row on"""
         try:
-            # Write chart data to worksheet
             data_start_row = start_row + 2
-            ws.cell(row=start_row, column=1, value=title).font = Font(bold=True)
-            
-            # Headers
-            ws.cell(row=data_start_row, column=1, value=category_col.replace('_', ' ').title())
-            ws.cell(row=data_start_row, column=2, value=value_col.replace('_', ' ').title())
-            
-            # Data
-            for idx, row in enumerate(data.itertuples(index=False), data_start_row + 1):
-                ws.cell(row=idx, column=1, value=getattr(row, category_col))
-                ws.cell(row=idx, column=2, value=getattr(row, value_col))
+            rows = self._chart_data_rows(ws, data, category_col, value_col, title)
                 
             # Create chart
             chart = PieChart()
@@ -343,3 +363,8 @@ class ExcelGenerator:
             
         except Exception as e:
             self.logger.warning(f"Failed to create pie chart: {str(e)}")
+            return
+            
+        # Write chart data to worksheet
+        for row in rows:
+            ws.append(row)
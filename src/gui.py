@@ -7,10 +7,17 @@ from tkinter import ttk, filedialog, messagebox
 import threading
 import logging
 import os
+import collections
+import queue
+import time
 from datetime import datetime
+from pathlib import Path
 from .data_processor import DataProcessor
 from .excel_generator import ExcelGenerator
 
+# Lines kept in the log display; older lines are trimmed (the log file keeps everything)
+MAX_LOG_LINES = 5000
+
 class BackOrderReportGUI:
     def __init__(self, root, config):
         self.root = root
@@ -22,10 +29,28 @@ class BackOrderReportGUI:
         self.progress_var = tk.DoubleVar()
         self.status_var = tk.StringVar(value="Ready")
         
+        # Updates posted by the worker thread; only _pump_gui touches Tk with them
+        self._gui_queue = queue.Queue()
+        
+        # (timestamp prefix, second, message) entries waiting for the next coalesced flush,
+        # bounded like the widget itself while the window is hidden
+        self._log_queue = collections.deque(maxlen=MAX_LOG_LINES)
+        
+        # "[HH:MM:" prefix of log timestamps, reformatted only when the minute changes
+        self._ts_minute = None
+        self._ts_prefix = ''
+        
+        # One long-lived worker runs queued reports. It is a daemon thread, so
+        # exiting the application does not wait for a report in progress
+        self._report_jobs = queue.Queue()
+        self._report_running = False
+        threading.Thread(target=self._run_reports, name="report", daemon=True).start()
+        
         self.data_processor = DataProcessor(config)
         self.excel_generator = ExcelGenerator(config)
         
         self.setup_gui()
+        self.root.after(50, self._pump_gui)
         
     def setup_gui(self):
         """Initialize and setup the GUI components"""
@@ -93,13 +118,17 @@ class BackOrderReportGUI:
         log_frame.rowconfigure(0, weight=1)
         main_frame.rowconfigure(4, weight=1)
         
-        # Log text widget with scrollbar
-        self.log_text = tk.Text(log_frame, height=10, wrap=tk.WORD)
+        # Log text widget with scrollbars: read-only, without undo history or
+        # line wrapping, so appends skip the undo stack and the wrap reflow
+        self.log_text = tk.Text(log_frame, height=10, wrap=tk.NONE, undo=False,
+                                autoseparators=False, maxundo=0, state="disabled")
         scrollbar = ttk.Scrollbar(log_frame, orient=tk.VERTICAL, command=self.log_text.yview)
-        self.log_text.configure(yscrollcommand=scrollbar.set)
+        x_scrollbar = ttk.Scrollbar(log_frame, orient=tk.HORIZONTAL, command=self.log_text.xview)
+        self.log_text.configure(yscrollcommand=scrollbar.set, xscrollcommand=x_scrollbar.set)
         
         self.log_text.grid(row=0, column=0, sticky="wens")
         scrollbar.grid(row=0, column=1, sticky="ns")
+        x_scrollbar.grid(row=1, column=0, sticky="we")
         
         # Control buttons
         button_frame = ttk.Frame(main_frame)
@@ -143,26 +172,99 @@ class BackOrderReportGUI:
             self.output_directory.set(directory)
             
     def log_message(self, message):
-        """Add message to log display"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        formatted_message = f"[{timestamp}] {message}\n"
+        """Queue message for the log display; safe to call from the worker thread"""
+        seconds = int(time.time())
+        minute = seconds // 60
+        if minute != self._ts_minute:
+            self._ts_prefix = time.strftime("[%H:%M:", time.localtime(seconds))
+            self._ts_minute = minute
+        
+        # The line itself is built on the Tk thread, in one join per flush
+        self._gui_queue.put(("log", (self._ts_prefix, seconds % 60, message)))
+        
+    def _pump_gui(self, max_items=500):
+        """Apply queued worker updates on the Tk thread, then reschedule every 50 ms"""
+        outcome = None
+        try:
+            for _ in range(max_items):
+                kind, payload = self._gui_queue.get_nowait()
+                if kind == "log":
+                    self._log_queue.append(payload)
+                elif kind == "progress":
+                    value, status = payload
+                    self.progress_var.set(value)
+                    self.status_var.set(status)
+                else:
+                    outcome = (kind, payload)
+        except queue.Empty:
+            pass
+            
+        self._flush_log()
+        self.root.after(50, self._pump_gui)
+        
+        # Success is shown as a non-blocking status line; errors still get a
+        # modal dialog, shown after the log is up to date
+        if outcome is not None:
+            kind, payload = outcome
+            self._report_running = False
+            self.process_button.config(state="normal")
+            if kind == "toast":
+                self.status_var.set(payload)
+                self._highlight_log()
+            else:
+                messagebox.showerror("Processing Error", payload)
+                
+    def _highlight_log(self, duration=1500):
+        """Briefly tint the log background to draw attention to a finished run"""
+        background = self.log_text.cget('background')
+        self.log_text.configure(background="#e6f4ea")
+        self.root.after(duration, lambda: self.log_text.configure(background=background))
+        
+    def _flush_log(self):
+        """Insert all queued log lines with a single insert and scroll"""
+        if not self._log_queue:
+            return
+            
+        # Skip the insert while the window is minimized or the log is hidden;
+        # lines stay queued and are shown once it is visible again
+        if self.root.state() == 'iconic' or not self.log_text.winfo_viewable():
+            return
+            
+        entries = []
+        while self._log_queue:
+            entries.append(self._log_queue.popleft())
+        blob = "".join(f"{prefix}{second:02d}] {message}\n" for prefix, second, message in entries)
+            
+        self.log_text.configure(state="normal")
+        self.log_text.insert(tk.END, blob)
         
-        self.log_text.insert(tk.END, formatted_message)
+        # Trim the oldest lines in one delete so the widget stays bounded
+        line_count = int(self.log_text.index('end-1c').split('.')[0])
+        if line_count > MAX_LOG_LINES:
+            self.log_text.delete('1.0', f'end-{MAX_LOG_LINES}l linestart')
+            
+        self.log_text.configure(state="disabled")
         self.log_text.see(tk.END)
-        self.root.update_idletasks()
         
     def clear_log(self):
         """Clear the log display"""
+        self.log_text.configure(state="normal")
         self.log_text.delete(1.0, tk.END)
+        self.log_text.configure(state="disabled")
         
     def update_progress(self, value, status):
-        """Update progress bar and status"""
-        self.progress_var.set(value)
-        self.status_var.set(status)
-        self.root.update_idletasks()
+        """Queue progress bar and status update; the mainloop redraws them on its next idle pass"""
+        self._gui_queue.put(("progress", (value, status)))
+        
+        # Called from the worker between heavy steps: yield the GIL so the Tk
+        # thread can pump the update right away
+        time.sleep(0)
         
     def start_processing(self):
-        """Start the report generation process in a separate thread"""
+        """Start the report generation process on the worker thread"""
+        if self._report_running:
+            return
+            
         if not self.input_file_path.get():
             messagebox.showerror("Error", "Please select an input file")
             return
@@ -174,13 +276,26 @@ class BackOrderReportGUI:
         # Disable the process button during processing
         self.process_button.config(state="disabled")
         
-        # Start processing in a separate thread
-        processing_thread = threading.Thread(target=self.process_report)
-        processing_thread.daemon = True
-        processing_thread.start()
-        
-    def process_report(self):
-        """Process the report generation"""
+        # Read the options on the Tk thread; the worker only gets plain values
+        options = {
+            'input_file': self.input_file_path.get(),
+            'output_directory': self.output_directory.get(),
+            'validate': self.validate_data.get(),
+            'report_type': self.report_type.get(),
+            'include_charts': self.include_charts.get(),
+        }
+        
+        # Start processing on the worker; it reports back through the GUI queue
+        self._report_running = True
+        self._report_jobs.put(options)
+        
+    def _run_reports(self):
+        """Worker loop: run queued reports one at a time for the life of the application"""
+        while True:
+            self.process_report(self._report_jobs.get())
+        
+    def process_report(self, options):
+        """Process the report generation; runs on the worker thread and reports back through the GUI queue"""
         try:
             self.logger.info("Starting report generation process")
             self.log_message("Starting report generation...")
@@ -190,12 +305,12 @@ class BackOrderReportGUI:
             
             # Load and validate data
             data = self.data_processor.load_data(
-                self.input_file_path.get(),
-                validate=self.validate_data.get()
+                options['input_file'],
+                validate=options['validate']
             )
             
             self.update_progress(30, "Processing data...")
-            self.log_message(f"Loaded {len(data)} records from input file")
+            self.log_message(f"Loaded {data.shape[0]} records from input file")
             
             # Process the data
             processed_data = self.data_processor.process_data(data)
@@ -206,29 +321,25 @@ class BackOrderReportGUI:
             # Generate output filename
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_filename = f"backorder_report_{timestamp}.xlsx"
-            output_path = os.path.join(self.output_directory.get(), output_filename)
+            output_path = str(Path(options['output_directory']) / output_filename)
             
             # Generate Excel report
             self.excel_generator.generate_report(
                 processed_data,
                 output_path,
-                report_type=self.report_type.get(),
-                include_charts=self.include_charts.get()
+                report_type=options['report_type'],
+                include_charts=options['include_charts']
             )
             
             self.update_progress(100, "Report generation completed!")
             self.log_message(f"Report saved to: {output_path}")
             
-            # Show success message
-            messagebox.showinfo("Success", f"Report generated successfully!\n\nSaved to: {output_path}")
+            # Report success in the status bar and re-enable the process button
+            self._gui_queue.put(("toast", f"Saved to {output_path}"))
             
         except Exception as e:
             error_msg = f"Error during processing: {str(e)}"
             self.logger.error(error_msg, exc_info=True)
             self.log_message(f"ERROR: {error_msg}")
             self.update_progress(0, "Error occurred")
-            messagebox.showerror("Processing Error", error_msg)
-            
-        finally:
-            # Re-enable the process button
-            self.process_button.config(state="normal")
+            self._gui_queue.put(("error", error_msg))
@@ -5,7 +5,16 @@ Logging Configuration Module
 import logging
 import logging.handlers
 import os
-from datetime import datetime
+import re
+import collections
+import queue
+import atexit
+import threading
+import time
+from pathlib import Path
+
+# Background writer for the file and console handlers, replaced on each setup_logging call
+_queue_listener = None
 
 def setup_logging(log_level='INFO', log_dir='logs', max_files=5, max_size_mb=10):
     """
@@ -19,31 +28,31 @@ def setup_logging(log_level='INFO', log_dir='logs', max_files=5, max_size_mb=10)
     """
     
     # Create logs directory if it doesn't exist
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
+    Path(log_dir).mkdir(parents=True, exist_ok=True)
         
-    # Configure log filename with timestamp
-    log_filename = os.path.join(log_dir, f'backorder_report_{datetime.now().strftime("%Y%m%d")}.log')
+    # Configure log filename; rotated files get their date appended
+    log_filename = str(Path(log_dir) / 'backorder_report.log')
     
     # Create formatters
-    detailed_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
+    detailed_formatter = FastFormatter(detailed=True)  # asctime - name - levelname - message
     
-    simple_formatter = logging.Formatter(
-        '%(levelname)s: %(message)s'
-    )
+    simple_formatter = FastFormatter(detailed=False)  # levelname: message
     
     # Configure root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, log_level.upper(), logging.INFO))
     
-    # Remove any existing handlers
+    # Remove any existing handlers and stop the writer thread behind them
+    global _queue_listener
+    if _queue_listener is not None:
+        atexit.unregister(_queue_listener.stop)
+        _queue_listener.stop()
+        _queue_listener = None
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
     
-    # File handler with rotation
-    file_handler = logging.handlers.RotatingFileHandler(
+    # File handler with rotation at midnight and on size
+    file_handler = BufferedRotatingFileHandler(
         log_filename,
         maxBytes=max_size_mb * 1024 * 1024,  # Convert MB to bytes
         backupCount=max_files - 1
@@ -56,36 +65,188 @@ def setup_logging(log_level='INFO', log_dir='logs', max_files=5, max_size_mb=10)
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(simple_formatter)
     
-    # Add handlers to root logger
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
+    # Loggers only enqueue records; a listener thread does the file and console
+    # writes, each handler still applying its own level
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    _queue_listener.start()
+    atexit.register(_queue_listener.stop)
     
     # Create application logger
     app_logger = logging.getLogger('backorder_report')
     app_logger.info("Logging system initialized")
+    app_logger.queue_listener = _queue_listener
     
     return app_logger
 
+class FastFormatter(logging.Formatter):
+    """
+    Formatter for the two fixed log layouts, built with an f-string from record
+    attributes instead of %-substituting the record's __dict__ for every record
+    """
+    
+    def __init__(self, detailed=True, datefmt=None):
+        super().__init__(datefmt=datefmt)
+        self.detailed = detailed
+        
+    def format(self, record):
+        """Format the record, appending exception and stack text like logging.Formatter"""
+        record.message = record.getMessage()
+        if self.detailed:
+            record.asctime = self.formatTime(record, self.datefmt)
+            s = f"{record.asctime} - {record.name} - {record.levelname} - {record.message}"
+        else:
+            s = f"{record.levelname}: {record.message}"
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            s = f"{s}\n{record.exc_text}"
+        if record.stack_info:
+            s = f"{s}\n{self.formatStack(record.stack_info)}"
+        return s
+        
+class BufferedRotatingFileHandler(logging.handlers.TimedRotatingFileHandler):
+    """
+    Log file handler that rotates at midnight and whenever the file reaches
+    maxBytes, writing through a 128 KiB buffer. StreamHandler flushes after
+    every record, which would leave the buffer unused, so a routine record only
+    triggers a flush if flush_interval seconds have passed since the last one;
+    otherwise a timer flushes it once the interval is up, so nothing written
+    while the application is idle stays in the buffer. Warnings and errors are
+    flushed immediately and closing the handler flushes the rest. The size
+    check uses a running byte count, since tell() on the stream would flush
+    the buffer for every record.
+    """
+    
+    buffer_size = 128 * 1024
+    flush_interval = 1.0
+    
+    def __init__(self, filename, maxBytes=0, backupCount=0, **kwargs):
+        self.maxBytes = maxBytes
+        self._last_flush = time.monotonic()
+        self._flush_now = False
+        self._flush_timer = None
+        self._bytes_written = 0
+        super().__init__(filename, when='midnight', backupCount=backupCount, **kwargs)
+        
+    def _open(self):
+        """Open the log file with the larger write buffer and seed the byte count from its size"""
+        stream = self._builtin_open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                                    encoding=self.encoding, errors=self.errors)
+        self._bytes_written = os.fstat(stream.fileno()).st_size
+        return stream
+        
+    def shouldRollover(self, record):
+        """Roll over at midnight, or earlier once the file has reached maxBytes"""
+        if super().shouldRollover(record):
+            return True
+        return self.maxBytes > 0 and self.stream is not None and self._bytes_written >= self.maxBytes
+        
+    def format(self, record):
+        """Format the record and add its encoded length to the running byte count"""
+        msg = super().format(record)
+        self._bytes_written += len((msg + self.terminator).encode(self.encoding or 'utf-8', 'replace'))
+        return msg
+        
+    def rotation_filename(self, default_name):
+        """
+        Number extra same-day backups (name.1, name.2, ...) instead of overwriting
+        them; numbers continue from the highest one left, so a name freed by
+        pruning is never reused for a newer file
+        """
+        name = super().rotation_filename(default_name)
+        dir_name, base_name = os.path.split(name)
+        numbered = re.compile(re.escape(base_name) + r'\.(\d+)')
+        numbers = [int(m.group(1)) for m in map(numbered.fullmatch, os.listdir(dir_name)) if m]
+        if numbers:
+            return f"{name}.{max(numbers) + 1}"
+        if os.path.exists(name):
+            return f"{name}.1"
+        return name
+        
+    def getFilesToDelete(self):
+        """Oldest backups beyond backupCount, ordered by date and then by backup number"""
+        dir_name, base_name = os.path.split(self.baseFilename)
+        backup = re.compile(re.escape(base_name) + r'\.(\d{4}-\d{2}-\d{2})(?:\.(\d+))?')
+        backups = []
+        for file_name in os.listdir(dir_name):
+            m = backup.fullmatch(file_name)
+            if m:
+                backups.append(((m.group(1), int(m.group(2) or 0)), os.path.join(dir_name, file_name)))
+        backups.sort()
+        if len(backups) <= self.backupCount:
+            return []
+        return [path for _, path in backups[:len(backups) - self.backupCount]]
+        
+    def emit(self, record):
+        """Write the record, flushing right away for warnings and errors"""
+        self._flush_now = record.levelno >= logging.WARNING
+        super().emit(record)
+        
+    def flush(self):
+        """Flush the write buffer if a flush is due, otherwise schedule one"""
+        now = time.monotonic()
+        if self._flush_now or now - self._last_flush >= self.flush_interval:
+            super().flush()
+            self._last_flush = now
+        elif self._flush_timer is None:
+            delay = self.flush_interval - (now - self._last_flush)
+            self._flush_timer = threading.Timer(delay, self._timed_flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+            
+    def _timed_flush(self):
+        """Flush records that were left in the buffer by a deferred flush"""
+        with self.lock:
+            self._flush_timer = None
+            super().flush()
+            self._last_flush = time.monotonic()
+            
+    def close(self):
+        """Cancel any pending timed flush, then flush and close the file"""
+        with self.lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+        super().close()
+            
 class GUILogHandler(logging.Handler):
-    """Custom log handler to display messages in GUI"""
+    """Custom log handler to display messages in GUI, batching records per flush"""
     
-    def __init__(self, text_widget):
-        super().__init__()
+    def __init__(self, text_widget, flush_interval=50, level=logging.INFO):
+        super().__init__(level)
         self.text_widget = text_widget
+        self.flush_interval = flush_interval
+        self._buffer = collections.deque()
+        self._flush_scheduled = False
         
     def emit(self, record):
-        """Emit a log record to the GUI text widget"""
+        """Buffer a log record; one scheduled flush writes all buffered records"""
+        if record.levelno < self.level:
+            return  # Filtered out; skip formatting entirely
         try:
-            msg = self.format(record)
-            # Schedule the GUI update in the main thread
-            self.text_widget.after(0, lambda: self._update_text(msg))
+            self._buffer.append(self.format(record) + '\n')
+            if not self._flush_scheduled:
+                self._flush_scheduled = True
+                # Schedule the GUI update in the main thread
+                self.text_widget.after(self.flush_interval, self._flush)
         except Exception:
             self.handleError(record)
             
-    def _update_text(self, message):
-        """Update the text widget with the log message"""
+    def _flush(self):
+        """Update the text widget with all buffered messages in one insert"""
+        self._flush_scheduled = False
+        messages = []
+        while self._buffer:
+            messages.append(self._buffer.popleft())
+        if not messages:
+            return
+            
         try:
-            self.text_widget.insert('end', message + '\n')
+            self.text_widget.insert('end', ''.join(messages))
             self.text_widget.see('end')
         except Exception:
             pass  # Ignore errors when GUI is closing
@@ -0,0 +1,25 @@
+"""
+Tests for the living color report helpers
+"""
+
+import unittest
+
+import pandas as pd
+
+from backorder_living_color import parse_dates
+
+
+class ParseDatesTest(unittest.TestCase):
+    def test_parses_mixed_format_date_strings(self):
+        result = parse_dates(pd.Series(['01/05/2024', '2024-02-03', '03/15/2024']))
+        self.assertEqual(list(result), [pd.Timestamp(2024, 1, 5), pd.Timestamp(2024, 2, 3), pd.Timestamp(2024, 3, 15)])
+
+    def test_keeps_values_that_are_not_dates(self):
+        result = parse_dates(pd.Series(['2024-02-03', 'TBD', None]))
+        self.assertEqual(result[0], pd.Timestamp(2024, 2, 3))
+        self.assertEqual(result[1], 'TBD')
+        self.assertTrue(pd.isna(result[2]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+Tests for the buffered rotating log file handler
+"""
+
+import logging
+import os
+import tempfile
+import unittest
+
+from src.logger import BufferedRotatingFileHandler
+
+
+class BufferedRotatingFileHandlerTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.tmp_dir.name, 'test.log')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _record(self, level=logging.INFO, msg='routine message'):
+        return logging.LogRecord('test', level, __file__, 1, msg, None, None)
+
+    def test_info_records_stay_buffered_with_size_limit(self):
+        handler = BufferedRotatingFileHandler(self.log_file, maxBytes=10 * 1024 * 1024, backupCount=1)
+        handler.flush_interval = 60
+        try:
+            for _ in range(50):
+                handler.handle(self._record())
+            self.assertEqual(os.path.getsize(self.log_file), 0)
+        finally:
+            handler.close()
+        self.assertGreater(os.path.getsize(self.log_file), 0)
+
+    def test_warning_flushes_immediately(self):
+        handler = BufferedRotatingFileHandler(self.log_file, maxBytes=10 * 1024 * 1024, backupCount=1)
+        handler.flush_interval = 60
+        try:
+            handler.handle(self._record(logging.WARNING, 'warning message'))
+            with open(self.log_file, encoding='utf-8') as f:
+                self.assertIn('warning message', f.read())
+        finally:
+            handler.close()
+
+    def test_rolls_over_at_max_bytes(self):
+        handler = BufferedRotatingFileHandler(self.log_file, maxBytes=1024, backupCount=3)
+        try:
+            for _ in range(100):
+                handler.handle(self._record(msg='x' * 100))
+        finally:
+            handler.close()
+        backups = [name for name in os.listdir(self.tmp_dir.name) if name != 'test.log']
+        self.assertTrue(backups)
+        self.assertLessEqual(len(backups), 3)
+        for name in backups:
+            self.assertLess(os.path.getsize(os.path.join(self.tmp_dir.name, name)), 1024 + 200)
+
+
+if __name__ == '__main__':
+    unittest.main()